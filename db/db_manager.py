@@ -1,11 +1,19 @@
 # db/db_manager.py
-from typing import Generator, Any
+from typing import Any, AsyncGenerator, Generator, Iterator
 from logger.logger import logger
-from contextlib import contextmanager
-from sqlalchemy import create_engine
+from contextlib import asynccontextmanager, contextmanager
+from sqlalchemy import create_engine, make_url, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
+# asyncio DBAPI driver used for each backend when running async sessions
+ASYNC_DRIVERS = {
+    'mysql': 'aiomysql',
+    'sqlite': 'aiosqlite',
+    'postgresql': 'asyncpg'
+}
+
 class MySQLManager:
     def __init__(self, db_string_credentials: str):
         """
@@ -20,22 +28,53 @@ class MySQLManager:
         self._string_connection = db_string_credentials
         self._engine = None
         self._session_maker = None
+        self._async_engine = None
+        self._async_session_maker = None
+
+    def _engine_options(self) -> dict:
+        """
+        Build create_engine options supported by the configured dialect
+
+        Returns:
+            dict: Keyword arguments for create_engine
+        """
+        url = make_url(self._string_connection)
+        # Batched executemany: multi-row INSERTs of up to 10000 rows per statement
+        options = dict(pool_pre_ping=True, insertmanyvalues_page_size=10000)
+
+        # SQLite (used in tests) runs on a single connection pool without sizing options
+        if url.get_backend_name() != 'sqlite':
+            options.update(pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=3600)
+
+        if url.get_driver_name() == 'psycopg2':
+            options.update(executemany_mode='values_plus_batch', executemany_batch_page_size=500)
+
+        return options
 
     def _connection(self):
         try:
-            self._engine = create_engine(
-                self._string_connection,
-                pool_size=5,
-                max_overflow=10,
-                pool_timeout=30,
-                pool_recycle=3600
-            )
+            self._engine = create_engine(self._string_connection, **self._engine_options())
             self._session_maker = sessionmaker(bind=self._engine)
             return True
         except SQLAlchemyError as e:
             logger.error(f"Failed to create connection database: {str(e)}")
             return False
 
+    def _async_connection(self):
+        url = make_url(self._string_connection)
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            logger.error(f"No asyncio driver configured for backend {backend}")
+            raise ValueError(f"No asyncio driver configured for backend {backend}")
+
+        async_url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+        options = self._engine_options()
+        # psycopg2 executemany options do not apply to asyncio drivers
+        options.pop('executemany_mode', None)
+        options.pop('executemany_batch_page_size', None)
+        self._async_engine = create_async_engine(async_url, **options)
+        self._async_session_maker = async_sessionmaker(bind=self._async_engine)
+
     def init_db(self, base_engine) -> bool:
         """
         Initialize the database with all tables
@@ -54,6 +93,19 @@ class MySQLManager:
             logger.error(f"Failed to initialize database: {str(e)}")
             return False
 
+    def bind_sessions(self, bind, **session_options) -> None:
+        """
+        Bind the sessions of session_scope to an engine or connection
+
+        Args:
+            bind: SQLAlchemy Engine or Connection the sessions run on
+            **session_options: Extra sessionmaker options, e.g. join_transaction_mode
+
+        Example:
+            manager.bind_sessions(connection, join_transaction_mode="create_savepoint")
+        """
+        self._session_maker = sessionmaker(bind=bind, **session_options)
+
     @contextmanager
     def session_scope(self) -> Generator[Session, None, None]:
         """
@@ -81,19 +133,70 @@ class MySQLManager:
         finally:
             session.close()
 
+    @asynccontextmanager
+    async def async_session_scope(self) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Provide an asyncio transactional scope around a series of operations.
+
+        The connection string is reused with the backend's asyncio driver
+        (see ASYNC_DRIVERS), e.g. mysql+pymysql becomes mysql+aiomysql.
+
+        Yields:
+            AsyncSession: SQLAlchemy asyncio session
+
+        Example:
+            async with manager.async_session_scope() as session:
+                await session.execute(statement)
+        """
+
+        if self._async_session_maker is None:
+            self._async_connection()
+
+        session = self._async_session_maker()
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Session error: {str(e)}")
+            raise
+        finally:
+            await session.close()
+
     def get_engine(self):
         """Get the SQLAlchemy engine"""
         return self._engine
 
     def get_all(self, table: Any) -> list:
-        with self.session_scope() as session:
-            results = session.query(table).all()
-            return [self._to_dict(obj) for obj in results]
+        return list(self.iter_all(table))
+
+    def iter_all(self, table: Any, batch_size: int = 1000) -> Iterator[dict]:
+        """
+        Stream all rows of a table as column/value dicts
 
-    def _to_dict(self, obj):
-        return {column.name: getattr(obj, column.name) for column in obj.__table__.columns}
+        Args:
+            table: SQLAlchemy declarative model
+            batch_size: Number of rows fetched from the cursor at a time
+
+        Yields:
+            dict: Row keyed by column name
+
+        Example:
+            for node in manager.iter_all(Node):
+                print(node['name'])
+        """
+        # Core select of the mapped table skips ORM instance and identity-map construction
+        statement = select(table.__table__).execution_options(yield_per=batch_size)
+        with self.session_scope() as session:
+            for row in session.execute(statement).mappings():
+                yield dict(row)
 
     def close(self):
         """Close the database connection"""
         if self._engine:
-            self._engine.dispose()
\ No newline at end of file
+            self._engine.dispose()
+
+    async def close_async(self):
+        """Close the asyncio database connection"""
+        if self._async_engine:
+            await self._async_engine.dispose()
\ No newline at end of file
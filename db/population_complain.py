@@ -1,15 +1,14 @@
-import pandas as pd
-from typing import Any, List
+from typing import Iterator, List, Optional
 from db.populator import Populator
 from models.driver_models import Trip
 from driver.driver_life import DriverLife
 
 class ComplainPopulator(Populator):
-    def create_record_complain(self, trip: Trip, driver_id: int) -> Any:
+    def create_record_complain(self, trip: Trip, driver_id: int) -> Optional[dict]:
         if len(trip.complain) == 0:
             return None
 
-        record = self.table(
+        record = dict(
             driver_id=driver_id,
             route_id=trip.route_id,
             connection_id=1,
@@ -21,11 +20,8 @@ class ComplainPopulator(Populator):
 
         return record
 
-    def create_record_list(self, driver_list: List[DriverLife]) -> list:
-        records = []
+    def create_record_list(self, driver_list: List[DriverLife]) -> Iterator[Optional[dict]]:
         for driver in driver_list:
             if not driver.trips:
                 raise ValueError("Trip list cannot be empty or list is empty")
-            records.extend([self.create_record_complain(trip, driver.driver_id) for trip in driver.trips])
-
-        return records
\ No newline at end of file
+            yield from (self.create_record_complain(trip, driver.driver_id) for trip in driver.trips)
\ No newline at end of file
@@ -1,42 +1,38 @@
 import random
-from typing import Any, List
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
 from db.populator import Populator
 from driver.driver_life import DriverLife
 
+_SEXES = ['M', 'F']
+
 class DriverPopulator(Populator):
-    def create_record_drive(self, driver: DriverLife) -> Any:
+    @staticmethod
+    def create_record_drive(driver: DriverLife, sex: Optional[str] = None) -> dict:
         if not driver.trips:
             raise ValueError("Trip list cannot be empty")
 
-        route_counts = Counter(trip.route_id for trip in driver.trips)
-        most_common_route = route_counts.most_common(1)[0][0] if route_counts else None
-
-        # Calculate complaint statistics
-        complains = [trip for trip in driver.trips if trip.has_complain]
-        complaint_topics = Counter(trip.complain for trip in complains)
-        most_common_topic = complaint_topics.most_common(1)[0][0] if complaint_topics else None
-
         # Calculate status
         status = 'quit' if driver.has_quit else 'active'
 
         adjusted_salary = 0.0
 
         # Randomly assign sex (this could be modified based on your requirements)
-        sex = random.choice(['M', 'F'])
+        if sex is None:
+            sex = random.choice(_SEXES)
 
-        record = self.table(
+        record = dict(
             driver_id=driver.driver_id,
             age=driver.age,
             sex=sex,
             location_id=driver.location_id,
-            route_list=','.join([str(i+1) for i in driver.assigned_routes]),
-            number_routes=len(driver.assigned_routes),
-            trip_list=','.join([str(trip.route_id) for trip in driver.trips]),
-            number_trips=len(driver.trips),
-            number_complains=len(complains),
-            most_common_complain_topic=1,
-            most_common_route=most_common_route,
+            route_list=driver.route_list_csv,
+            number_routes=driver.number_routes,
+            trip_list=driver.trip_route_csv,
+            number_trips=driver.number_trips,
+            number_complains=driver.number_complains,
+            most_common_complain_topic=driver.most_common_topic,
+            most_common_route=driver.most_common_route,
             status=status,
             salary=adjusted_salary,
             experience=driver.experience
@@ -44,5 +40,31 @@ class DriverPopulator(Populator):
 
         return record
 
-    def create_record_list(self, driver_list: List[DriverLife]) -> list:
-        return [self.create_record_drive(drive) for drive in driver_list]
\ No newline at end of file
+    def create_record_list(self, driver_list: List[DriverLife], workers: int = 1) -> list:
+        """
+        Build driver records, optionally spreading the drivers over a process pool
+
+        Args:
+            driver_list: Simulated drivers
+            workers: Number of worker processes (default 1 builds records in-process)
+
+        Returns:
+            List of driver records in the same order as driver_list
+        """
+        # Sexes are drawn in the parent so results do not depend on the worker count
+        sexes = random.choices(_SEXES, k=len(driver_list))
+        if workers <= 1:
+            return [self.create_record_drive(drive, sex) for drive, sex in zip(driver_list, sexes)]
+
+        chunk_size = -(-len(driver_list) // workers)
+        chunks = [
+            list(zip(driver_list[i:i + chunk_size], sexes[i:i + chunk_size]))
+            for i in range(0, len(driver_list), chunk_size)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return [record for chunk in executor.map(_build_records_chunk, chunks) for record in chunk]
+
+
+def _build_records_chunk(chunk: List[Tuple[DriverLife, str]]) -> list:
+    """Build the records of a chunk of drivers inside a worker process"""
+    return [DriverPopulator.create_record_drive(drive, sex) for drive, sex in chunk]
\ No newline at end of file
@@ -4,6 +4,9 @@ from db.populator import Populator
 from models.db_models import UnloadingDifficult
 from logger.logger import logger
 
+# Member names of the Enum column, listed once at import instead of a list(EnumType) per sampled row
+_UNLOADING_DIFFICULTIES = [member.name for member in UnloadingDifficult]
+
 class NodePopulator(Populator):
     def generate_unique_cities(self, count: int) -> List[str]:
         """
@@ -15,15 +18,16 @@ class NodePopulator(Populator):
         Returns:
             List of unique city names
         """
-        cities = set()
-        max_attempts = count * 2  # Maximum attempts to avoid infinite loop
-        attempts = 0
+        # Generate a batch with headroom for duplicates, dedup keeping first-seen order
+        cities = dict.fromkeys(self.faker.city() for _ in range(count * 2))
 
-        while len(cities) < count and attempts < max_attempts:
-            cities.add(self.faker.city())
+        # Top up if too many duplicates were drawn, bounded to avoid an infinite loop
+        attempts = 0
+        while len(cities) < count and attempts < count:
+            cities.setdefault(self.faker.city())
             attempts += 1
 
-        return list(cities)
+        return list(cities)[:count]
 
     def generate_records_by_number(self, number_records: int = 32) -> list:
         """
@@ -37,11 +41,12 @@ class NodePopulator(Populator):
         """
         try:
             cities = self.generate_unique_cities(number_records)
+            difficulties = random.choices(_UNLOADING_DIFFICULTIES, k=len(cities))
             nodes = [
-                    self.table(
+                    dict(
                         name=city,
-                        node_difficult=random.choice(list(UnloadingDifficult)))
-                    for city in cities
+                        node_difficult=difficulty)
+                    for city, difficulty in zip(cities, difficulties)
                 ]
 
             return nodes
@@ -1,21 +1,37 @@
 import random
-from typing import Any, Set, Tuple
+from typing import Set, Tuple
 from db.populator import Populator
 from models.db_models import HighwayClassification, HighwayCondition, HighwayDifficult
 from logger.logger import logger
 
-class SimpleConnectionPopulator(Populator):
-    def create_record_connection(self, start_node: int, end_node: int) -> Any:
-        record = self.table(
-            start_node=start_node+1,
-            end_node=end_node+1,
-            highway_classification=random.choice(list(HighwayClassification)),
-            highway_condition=random.choice(list(HighwayCondition)),
-            highway_difficult=random.choice(list(HighwayDifficult)),
-            assault_risk=random.uniform(0,1)/10.0
-        )
+# Member names of the Enum columns, listed once at import instead of a list(EnumType) per sampled row
+_HIGHWAY_CLASSIFICATIONS = [member.name for member in HighwayClassification]
+_HIGHWAY_CONDITIONS = [member.name for member in HighwayCondition]
+_HIGHWAY_DIFFICULTIES = [member.name for member in HighwayDifficult]
 
-        return record
+class SimpleConnectionPopulator(Populator):
+    def create_record_connection(self, start_node: int, end_node: int) -> dict:
+        return self.create_record_list([(start_node, end_node)])[0]
 
     def create_record_list(self, connection_list: Set[Tuple[int]]) -> list:
-        return [self.create_record_connection(x[0], x[1]) for x in connection_list]
\ No newline at end of file
+        connections = list(connection_list)
+        n = len(connections)
+
+        # Sample every attribute column in one call instead of per connection
+        classifications = random.choices(_HIGHWAY_CLASSIFICATIONS, k=n)
+        conditions = random.choices(_HIGHWAY_CONDITIONS, k=n)
+        difficulties = random.choices(_HIGHWAY_DIFFICULTIES, k=n)
+        assault_risks = [random.random() / 10.0 for _ in range(n)]
+
+        return [
+            dict(
+                start_node=start_node+1,
+                end_node=end_node+1,
+                highway_classification=classification,
+                highway_condition=condition,
+                highway_difficult=difficulty,
+                assault_risk=assault_risk
+            )
+            for (start_node, end_node), classification, condition, difficulty, assault_risk
+            in zip(connections, classifications, conditions, difficulties, assault_risks)
+        ]
\ No newline at end of file
@@ -1,21 +1,21 @@
 import pandas as pd
-from typing import Any, List
+from typing import Dict, Iterator, List
 from db.populator import Populator
 from models.driver_models import Trip
 from driver.driver_life import DriverLife
 
 class TripPopulator(Populator):
-    def create_record_trip(self, trip: Trip, driver_id: int, route_df: pd.DataFrame) -> Any:
+    def create_record_trip(self, trip: Trip, driver_id: int, price_by_route: Dict[int, float]) -> dict:
         if not trip.start_datetime:
             raise ValueError("Start datetime is required")
 
         # Calculate total payment
         payment = self.compute_payment(
             route_id = trip.route_id,
-            route_df = route_df
+            price_by_route = price_by_route
         )
 
-        record = self.table(
+        record = dict(
             driver_id=driver_id,
             route_id=trip.route_id,
             complete=trip.on_time,
@@ -27,15 +27,18 @@ class TripPopulator(Populator):
 
         return record
 
-    def create_record_list(self, driver_list: List[DriverLife], route_df: pd.DataFrame) -> list:
-        records = []
+    def create_record_list(self, driver_list: List[DriverLife], route_df: pd.DataFrame) -> Iterator[dict]:
+        # Build the route price lookup once instead of masking route_df for every trip
+        price_by_route = self.price_mapping(route_df)
         for driver in driver_list:
             if not driver.trips:
                 raise ValueError("Trip list cannot be empty or list is empty")
-            records.extend([self.create_record_trip(trip, driver.driver_id,  route_df) for trip in driver.trips])
+            yield from (self.create_record_trip(trip, driver.driver_id,  price_by_route) for trip in driver.trips)
 
-        return records
+    @staticmethod
+    def price_mapping(route_df: pd.DataFrame) -> Dict[int, float]:
+        return dict(zip(route_df['route_id'].to_numpy().tolist(), route_df['price'].to_numpy().tolist()))
 
     @staticmethod
-    def compute_payment(route_id: int, route_df: pd.DataFrame) -> float:
-        return route_df[route_df['route_id'] == route_id]['price'].iloc[0]
\ No newline at end of file
+    def compute_payment(route_id: int, price_by_route: Dict[int, float]) -> float:
+        return price_by_route[route_id]
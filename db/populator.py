@@ -1,9 +1,14 @@
 import random
 from faker import Faker
-from typing import List, Optional, Any
+from sqlalchemy import insert
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator, Optional
 from db.db_manager import MySQLManager
 from logger.logger import logger
 
+# Locale data is loaded once per process and shared by every populator
+_FAKER = Faker(['en_US', 'es_ES'])
+
 class Populator:
     def __init__(self, db_manager: MySQLManager, table: Any, seed: Optional[int] = None):
         """
@@ -15,7 +20,7 @@ class Populator:
         """
         self.db_manager = db_manager
         self.table = table
-        self.faker = Faker(['en_US', 'es_ES'])
+        self.faker = _FAKER
         if seed is not None:
             Faker.seed(seed)
             random.seed(seed)
@@ -27,20 +32,106 @@ class Populator:
             raise ValueError("Number of records must be at least 1 or list_record should be declared")
         return []
 
-    def populate(self, number_records: int = -1, list_records: list = None):
-        if (not list_records is None) and (not isinstance(list_records[0], self.table)):
-            logger.error("Records are not compatible with stated table")
-            raise TypeError("Records are not compatible with stated table")
+    def populate(self, number_records: int = -1, list_records: Iterable = None, batch_size: int = 10_000):
+        """
+        Insert records into the stated table in batches
+
+        Args:
+            number_records: Number of records to generate when list_records is not given
+            list_records: List or iterator of records (row dicts or ORM instances)
+            batch_size: Maximum number of rows sent in a single bulk insert
+        """
+        batches = self._prepare_batches(number_records, list_records, batch_size)
+
+        inserted = 0
+        with self.db_manager.session_scope() as session:
+            for batch in batches:
+                # Core executemany lets SQLAlchemy batch rows into multi-row INSERTs (insertmanyvalues)
+                session.execute(insert(self.table), [self._to_row(record) for record in batch])
+                inserted += len(batch)
+            logger.info(f"Successfully inserted {inserted} records")
+
+    async def populate_async(self, number_records: int = -1, list_records: Iterable = None, batch_size: int = 10_000):
+        """
+        Insert records into the stated table in batches over an asyncio session,
+        so the inserts of several tables can overlap on the event loop.
+
+        Only tables without foreign keys between them can be populated together:
+        nodes and topics first, then routes and connections once nodes exist.
+
+        Args:
+            number_records: Number of records to generate when list_records is not given
+            list_records: List or iterator of records (row dicts or ORM instances)
+            batch_size: Maximum number of rows sent in a single bulk insert
+
+        Example:
+            await asyncio.gather(
+                node_populator.populate_async(list_records=nodes),
+                topic_populator.populate_async(list_records=topics)
+            )
+        """
+        batches = self._prepare_batches(number_records, list_records, batch_size)
+
+        inserted = 0
+        async with self.db_manager.async_session_scope() as session:
+            for batch in batches:
+                await session.execute(insert(self.table), [self._to_row(record) for record in batch])
+                inserted += len(batch)
+            logger.info(f"Successfully inserted {inserted} records")
+
+    def _prepare_batches(self, number_records: int, list_records: Optional[Iterable], batch_size: int) -> Iterator[list]:
+        """Generate records if needed, validate the first one and return the record batches"""
         if list_records is None:
             list_records = self.generate_records_by_number(number_records=number_records)
 
-        if len(list_records) == 0:
+        batches = self._batched(list_records, batch_size)
+        first_batch = next(batches, None)
+
+        if first_batch is None:
             logger.error("Method has not been implemented yet or list is empty")
             raise ValueError("Method has not been implemented yet or list is empty")
+        if not self._is_compatible(first_batch[0]):
+            logger.error("Records are not compatible with stated table")
+            raise TypeError("Records are not compatible with stated table")
 
-        with self.db_manager.session_scope() as session:
-            session.add_all(list_records)
-            logger.info(f"Successfully inserted {len(list_records)} records")
+        return chain([first_batch], batches)
+
+    @staticmethod
+    def _batched(records: Iterable, batch_size: int) -> Iterator[list]:
+        """Yield consecutive lists of at most batch_size records"""
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        iterator = iter(records)
+        while batch := list(islice(iterator, batch_size)):
+            yield batch
+
+    def _is_compatible(self, record: Any) -> bool:
+        """
+        Check that a record can be inserted into the stated table
+
+        Args:
+            record: Row dict keyed by column name, or an ORM instance of the table
+
+        Returns:
+            bool: True if every key of the row is a column of the table
+        """
+        if isinstance(record, dict):
+            return set(record).issubset(self.table.__table__.columns.keys())
+        return isinstance(record, self.table)
+
+    def _to_row(self, record: Any) -> dict:
+        """
+        Convert a record into a column/value dict for a Core bulk insert.
+        Row dicts pass through; for ORM instances unset columns are skipped so
+        database and column defaults still apply.
+        """
+        if isinstance(record, dict):
+            return record
+        return {
+            column.name: getattr(record, column.name)
+            for column in self.table.__table__.columns
+            if getattr(record, column.name) is not None
+        }
 
 
 
@@ -1,25 +1,140 @@
-import random
+import asyncio
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import List, Set, Tuple
-from driver.risk_score import calculate_trouble_score
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from numba import njit
+from typing import Coroutine, Dict, List, NamedTuple, Optional, Set, Tuple
+from driver.risk_score import (
+    BASE_RISK, CLASS_CODES, CONDITION_CODES, DIFFICULTY_CODES, UNLOADING_CODES, route_trouble_score
+)
 from driver.driver_prompts import PromptGenerator, driver_context
-from models.driver_models import DriverProfile, Trip
+from models.driver_models import DriverProfile, Trip, trips_to_soa
 from open_ai.open_ai_handler import OpenAIHandler
 
-prompter = PromptGenerator()
-gpt_chat = OpenAIHandler()
+@lru_cache(maxsize=1)
+def get_prompter() -> PromptGenerator:
+    """Shared prompt generator, built on first use"""
+    return PromptGenerator()
+
+@lru_cache(maxsize=1)
+def get_chat() -> OpenAIHandler:
+    """Shared OpenAI handler, built on first use so importing the module (or a worker) needs no API client"""
+    return OpenAIHandler()
+
+# Microseconds in an hour, the resolution of the simulated trip timeline
+_US_PER_HOUR = 3_600_000_000
+
+# Slots rebuilt from the shared route, node and connection data on every simulation
+_SIMULATION_ONLY_SLOTS = (
+    '_edge_index', '_edge_risks', '_edge_codes', '_node_codes', '_route_cache', '_assigned_routes_array'
+)
+
+class EdgeTables(NamedTuple):
+    """Connection and node data of the trouble score kernel, shared read-only by every driver"""
+    # (start_node, end_node) -> row of edge_risks and edge_codes; first row wins on duplicates
+    edge_index: Dict[Tuple[int, int], int]
+    edge_risks: np.ndarray
+    # (connections, 3) int8 class, condition and difficulty codes
+    edge_codes: np.ndarray
+    # node_id -> unloading code
+    node_codes: Dict[int, int]
+
+
+def build_edge_tables(node_df: pd.DataFrame, connection_df: pd.DataFrame) -> EdgeTables:
+    """
+    Convert the node and connection tables into the lookup arrays used while simulating
+
+    Args:
+        node_df: Nodes with node_id and node_difficult
+        connection_df: Connections between nodes with risk and highway data
+
+    Returns:
+        EdgeTables with enum columns stored as the integer codes of the trouble score kernel
+    """
+    connections = connection_df.drop_duplicates(['start_node', 'end_node'])
+    edge_index = {
+        edge: row for row, edge in
+        enumerate(zip(connections['start_node'].tolist(), connections['end_node'].tolist()))
+    }
+    edge_risks = connections['assault_risk'].to_numpy(dtype=np.float32)
+    edge_codes = np.column_stack([
+        connections['highway_classification'].map(CLASS_CODES).to_numpy(dtype=np.int8),
+        connections['highway_condition'].map(CONDITION_CODES).to_numpy(dtype=np.int8),
+        connections['highway_difficult'].map(DIFFICULTY_CODES).to_numpy(dtype=np.int8)
+    ])
+    nodes = node_df.drop_duplicates('node_id')
+    node_codes = dict(zip(nodes['node_id'].tolist(), nodes['node_difficult'].map(UNLOADING_CODES).tolist()))
+    return EdgeTables(edge_index, edge_risks, edge_codes, node_codes)
+
+
+@njit(cache=True)
+def _stress_recurrence(trip_troubles: np.ndarray,
+                       decay_factor: float,
+                       stress_score: float,
+                       stress_decay: float,
+                       complain_threshold: float,
+                       quit_threshold: float):
+    """
+    Smooth the trouble of consecutive trips and accumulate the driver's stress until they quit.
+
+    Args:
+        trip_troubles: Trouble score of each trip before smoothing
+        decay_factor: Weight of the previous trouble score
+        stress_score: Stress before the first trip
+        stress_decay: Fraction of stress released before each trip
+        complain_threshold: Stress from which the driver complains
+        quit_threshold: Stress from which the driver quits
+
+    Returns:
+        Tuple of (trouble scores, stress scores, complain flags, final stress, has quit), the
+        arrays truncated at the trip where the driver quits
+    """
+    number_trips = trip_troubles.shape[0]
+    trouble_scores = np.empty(number_trips)
+    stress_scores = np.empty(number_trips)
+    complains = np.empty(number_trips, dtype=np.bool_)
+
+    trouble_score = 0.0
+    for i in range(number_trips):
+        trouble_score = 0.2*trouble_score*decay_factor + 0.8*trip_troubles[i]
+
+        # Apply decay to current stress and add the stress impact of the trouble (fuzzy logic)
+        stress_score *= (1 - stress_decay)
+        if trouble_score < 0.01:
+            stress_impact = 0.0
+        elif trouble_score <= 0.7:
+            stress_impact = trouble_score
+        else:
+            stress_impact = 0.7 * 1.2
+        stress_score = stress_score + stress_impact
+
+        trouble_scores[i] = trouble_score
+        stress_scores[i] = stress_score
+        complains[i] = stress_score >= complain_threshold
+        if stress_score >= quit_threshold:
+            return trouble_scores[:i + 1], stress_scores[:i + 1], complains[:i + 1], stress_score, True
+
+    return trouble_scores, stress_scores, complains, stress_score, False
+
 
-@dataclass
 class DriverLife:
+    __slots__ = (
+        'driver_id', 'stress_score', 'has_quit', 'complain_threshold', 'quit_threshold', 'stress_decay',
+        'location_id', 'start_date', 'age', 'experience', 'number_trips', 'assigned_routes', 'trips',
+        'number_routes', 'most_common_route', 'number_complains', 'most_common_topic', 'trip_route_csv',
+        'route_list_csv', '_rng', '_edge_index', '_edge_risks', '_edge_codes', '_node_codes', '_route_cache',
+        '_assigned_routes_array', '_pending_complaints'
+    )
+
     def __init__(self,
                  driver_id: int,
                  number_locations: int,
                  route_data: dict = None,
                  node_df: pd.DataFrame = None,
                  connection_df: pd.DataFrame = None,
+                 edge_tables: Optional[EdgeTables] = None,
                  start_date: datetime = datetime(2024, 1, 1),
                  mean_trips: float = 150,
                  sd_trips: float = 20,
@@ -31,13 +146,17 @@ class DriverLife:
                  rate_hours: float = 1 / 48,
                  complain_threshold: float = 0.7,
                  quit_threshold: float = 1.6,
-                 stress_decay: float = 0.3
+                 stress_decay: float = 0.3,
+                 seed: Optional[int] = None,
+                 generate_complaints: bool = True
                  ):
         """
         Initialize a driver with their characteristics and simulate their trips
 
         Args:
             location_id: Node ID where driver is based
+            edge_tables: Lookup arrays from build_edge_tables, shared by a fleet of drivers. When None
+                they are built from node_df and connection_df
             start_date: Beginning of simulation period
             mean_trips: Mean number of trips per year
             sd_trips: Standard deviation of trips per year
@@ -47,6 +166,9 @@ class DriverLife:
             max_routes: Maximum number of routes assigned to driver
             total_routes: Total number of routes available
             rate_hours: Rate parameter for exponential distribution of inter-trip times
+            seed: Optional seed for the driver's random generator
+            generate_complaints: Request the complaint messages right after simulating. When False the
+                prompts stay pending until complete_complaints is called, e.g. for a whole fleet at once
         """
         self.driver_id = driver_id
         self.stress_score = 0.0
@@ -54,243 +176,355 @@ class DriverLife:
         self.complain_threshold = complain_threshold
         self.quit_threshold = quit_threshold
         self.stress_decay = stress_decay
-        self.location_id = np.random.randint(1, number_locations + 1)
+        # Own PCG64 generator per driver instead of the shared legacy np.random state
+        self._rng = np.random.default_rng(seed)
+        self.location_id = int(self._rng.integers(1, number_locations + 1))
         self.start_date = start_date
 
+        # Connection data as parallel arrays, see build_edge_tables
+        if edge_tables is None:
+            edge_tables = build_edge_tables(node_df, connection_df)
+        self._edge_index, self._edge_risks, self._edge_codes, self._node_codes = edge_tables
+
         # Generate driver's characteristics
-        self.age = int(max(30.0, np.random.normal(40, 3)))
-        self.experience = int(max(0.0, np.random.normal(mean_exp, sd_exp)))
-        self.number_trips = int(max(1.0, np.random.normal(mean_trips, sd_trips)))
+        self.age = int(max(30.0, self._rng.normal(40, 3)))
+        self.experience = int(max(0.0, self._rng.normal(mean_exp, sd_exp)))
+        self.number_trips = int(max(1.0, self._rng.normal(mean_trips, sd_trips)))
 
         # Assign random routes to driver
-        num_routes = np.random.randint(min_routes, max_routes + 1)
-        self.assigned_routes: Set[int] = set(np.random.choice(total_routes,
+        num_routes = self._rng.integers(min_routes, max_routes + 1)
+        self.assigned_routes: Set[int] = set(self._rng.choice(total_routes,
                                                               size=num_routes,
                                                               replace=False))
+        self._assigned_routes_array = np.fromiter(self.assigned_routes, dtype=np.int64,
+                                                  count=len(self.assigned_routes))
+
+        # Edge assault risks and trouble score of each assigned route (routes are 1-based in route_data)
+        self._route_cache = {route + 1: self._route_profile(route_data[route + 1]) for route in self.assigned_routes}
 
         # Simulate trips
-        self.trips: List[Trip] = self._simulate_trips(rate_hours, route_data, connection_df, node_df)
+        self._pending_complaints: List[Tuple[int, str]] = []
+        self.trips: List[Trip] = self._simulate_trips(rate_hours, route_data)
+        if generate_complaints:
+            complete_complaints([self])
 
         # Calculate derived statistics
         self._calculate_statistics()
 
+    def __getstate__(self):
+        """Pickle the driver without the lookup tables, which are only needed while simulating."""
+        return {
+            name: getattr(self, name) for name in self.__slots__
+            if name not in _SIMULATION_ONLY_SLOTS and hasattr(self, name)
+        }
+
+    def __setstate__(self, state):
+        """Restore slot values, including pickles saved before DriverLife used __slots__ (plain dict state)."""
+        if isinstance(state, tuple):
+            instance_dict, slot_state = state
+            state = {**(instance_dict or {}), **slot_state}
+        for name, value in state.items():
+            setattr(self, name, value)
+        if not hasattr(self, '_pending_complaints'):
+            self._pending_complaints = []
+        # Older pickles predate the fused trip statistics
+        if not hasattr(self, 'number_complains'):
+            self._calculate_statistics()
+
     @staticmethod
     def get_connections(path_string) -> List[Tuple[int, int]]:
         """Get list of node connections in route."""
-        nodes = [int(x) for x in path_string.split(',')]
-        return list(zip(nodes[:-1], nodes[1:]))
+        return list(map(tuple, parse_route_edges(path_string).tolist()))
 
-    @staticmethod
-    def _calculate_stress_impact(trouble_score: float) -> float:
+    def _route_profile(self, route: dict) -> Tuple[np.ndarray, float]:
         """
-        Calculate stress impact based on trouble score using fuzzy logic.
+        Precompute the per-route quantities that do not change between trips.
 
         Args:
-            trouble_score: Current trip's trouble score
+            route: Route data with intermediate_nodes (or pre-parsed edges), distance and end_node
 
         Returns:
-            Float representing stress impact
+            Tuple of (per-connection assault risks, trouble score before on-time factor)
         """
-        if trouble_score < 0.01:
-            return 0.0
-        elif trouble_score <= 0.7:
-            return trouble_score
-        else:
-            return 0.7 * 1.2
-
-    def _update_stress_score(self, trouble_score: float) -> Tuple[bool, bool]:
+        edges = route['edges'] if 'edges' in route else parse_route_edges(route['intermediate_nodes'])
+        rows = [self._edge_index[connection] for connection in map(tuple, edges.tolist())]
+        assault_risks = self._edge_risks[rows]
+
+        # Trouble only depends on the route and the driver's experience, so it is summed once.
+        # Unloading counts from the first connection reaching the end node on
+        ends = edges[:, 1]
+        reaches_end = np.flatnonzero(ends == route['end_node'])
+        first_unloading_edge = int(reaches_end[0]) if len(reaches_end) else len(ends)
+        unloading_codes = np.array([self._node_codes[end] for end in ends.tolist()], dtype=np.int8)
+        trouble_score = route_trouble_score(
+            self._edge_codes[rows],
+            unloading_codes,
+            first_unloading_edge,
+            float(self.experience),
+            float(route['distance']),
+            BASE_RISK
+        )
+
+        return assault_risks, trouble_score
+
+    def _simulate_trouble(self, route_indexes: np.ndarray, on_times: np.ndarray, assaults: np.ndarray) -> np.ndarray:
         """
-        Update driver's stress score and determine if they complain or quit.
+        Simulate the trouble of every trip from the connections in its route.
 
         Args:
-            trouble_score: Current trip's trouble score
+            route_indexes: Position in the assigned routes array of each trip's route
+            on_times: Whether each trip was completed on time
+            assaults: Whether the driver was assaulted on each trip
 
         Returns:
-            Tuple of (has_complain, has_quit)
-        """
-        # Apply decay to current stress
-        self.stress_score *= (1 - self.stress_decay)
-
-        # Add new stress from trouble
-        stress_impact = self._calculate_stress_impact(trouble_score)
-        self.stress_score = self.stress_score + stress_impact
-
-        # Check for complain and quit conditions
-        has_complain = (self.stress_score >= self.complain_threshold)
-        has_quit = self.stress_score >= self.quit_threshold
-        if has_quit:
-            self.has_quit = True
-
-        return has_complain, has_quit
-
-    def _simulate_trouble(
-            self,
-            path_string: str,
-            path_distance: float,
-            end_node: int,
-            time_ok: bool,
-            assaulted: bool,
-            connection_df: pd.DataFrame,
-            node_df: pd.DataFrame
-    ) -> float:
-        """
-        Simulate trouble possibility for each connection in route.
-
-        Args:
-            path_string: String with path trip
-            connection_df: DataFrame with assault risk for each connection
-            node_df: DataFrame with node difficulty
-
-        Returns:
-            float: Trouble score
+            Trouble score of each trip, before it is smoothed with the previous trips
         """
+        route_troubles = np.array([self._route_cache[int(route) + 1][1] for route in self._assigned_routes_array])
+        on_time_factors = np.where(on_times, 0.8, 1.0)
 
         # if the driver is assaulted, the trouble score is 1
-        if assaulted:
-            return 1.0
-
-        # in other case, the trouble score is calculated based on the connections
-        trouble_score = 0.0
-        omit_unloading = True
-        path_connections = self.get_connections(path_string=path_string)
-        for start, end in path_connections:
-            connection_row = connection_df[(connection_df['start_node'] == start) & (connection_df['end_node'] == end)]
-            highway_classification = connection_row['highway_classification'].iloc[0]
-            highway_condition = connection_row['highway_condition'].iloc[0]
-            highway_difficulty = connection_row['highway_difficult'].iloc[0]
-            unloading_difficulty = node_df[node_df['node_id'] == end]['node_difficult'].iloc[0]
-            if end == end_node:
-                omit_unloading = False
-
-            trouble_score += calculate_trouble_score(
-                highway_class=highway_classification,
-                highway_condition=highway_condition,
-                highway_difficulty=highway_difficulty,
-                unloading_difficulty=unloading_difficulty,
-                driver_experience=self.experience,
-                distance=path_distance,
-                omit_unloading=omit_unloading
-            )
+        return np.where(assaults, 1.0, route_troubles[route_indexes] * on_time_factors)
 
-        on_time_factor = 0.8 if time_ok else 1.0
-
-        return trouble_score*on_time_factor
-
-    def _simulate_assault(self, path_string: str, connection_df: pd.DataFrame) -> Tuple[
-        bool, float]:
+    def _simulate_assault(self, route_indexes: np.ndarray, edge_draws: np.ndarray) -> np.ndarray:
         """
-        Simulate assault possibility for each connection in route.
+        Simulate assault possibility for each connection in the route of every trip.
 
         Args:
-            path_string: String with path trip
-            connection_df: DataFrame with assault risk for each connection
+            route_indexes: Position in the assigned routes array of each trip's route
+            edge_draws: Pre-drawn uniforms, one row per trip with at least one per connection
 
         Returns:
-            Tuple of (was_assaulted, connection_status, completion_time_reduction)
+            Boolean array telling whether the driver was assaulted on each trip
         """
-        was_assaulted = False
-
-        for start, end in self.get_connections(path_string=path_string):
-            assault_risk = float(connection_df[(connection_df['start_node'] == start) & (connection_df['end_node'] == end)]['assault_risk'].iloc[0])
-            is_connection_assaulted = random.random() < assault_risk
-            was_assaulted = was_assaulted or is_connection_assaulted
-
-        # If assaulted, generate random completion time reduction
-        completion_time_reduction = random.uniform(0.05, 0.20) if was_assaulted else 0.0
+        # Assault risks of every assigned route, zero padded to the width of edge_draws
+        risk_table = np.zeros((len(self._assigned_routes_array), edge_draws.shape[1]), dtype=np.float32)
+        for row, route in enumerate(self._assigned_routes_array):
+            assault_risks = self._route_cache[int(route) + 1][0]
+            risk_table[row, :len(assault_risks)] = assault_risks
 
-        return was_assaulted, completion_time_reduction
+        return (edge_draws < risk_table[route_indexes]).any(axis=1)
 
     def _simulate_trips(
             self,
             rate_hours: float,
-            route_data: dict,
-            connection_df: pd.DataFrame,
-            node_df: pd.DataFrame
+            route_data: dict
         ) -> List[Trip]:
         """Simulate all trips for the driver over the year."""
 
         trips = []
-        trouble_score = 0.0
         decay_factor = 0.5
-        current_time = self.start_date + timedelta(hours=np.random.exponential(1 / rate_hours))
-
-        for _ in range(self.number_trips):
-            complain = ''
-            # Select random route from driver's assigned routes
-            route_id = int(np.random.choice(list(self.assigned_routes)) + 1)
-
-            # Get minimum completion time for this route (this should come from route data)
-            min_completion_time = route_data[route_id]['min_completion_time']
-            max_completion_time = route_data[route_id]['max_completion_time']
-
-            # Generate completion time using Weibull distribution
-            completion_noise = np.random.normal(0.95, 0.1)
-            completion_hours = np.random.uniform(min_completion_time, max_completion_time)*completion_noise
-
-            completion_time = current_time + timedelta(hours=completion_hours)
-            was_assaulted, completion_time_reduction = self._simulate_assault(
-                path_string=route_data[route_id]['intermediate_nodes'],
-                connection_df=connection_df)
-
-            if was_assaulted:
-                completion_time = completion_time - timedelta(hours=completion_hours * completion_time_reduction)
-
-            on_time = (completion_hours <= max_completion_time) and (not was_assaulted)
-            trouble_score = (0.2*trouble_score*decay_factor + 0.8*self._simulate_trouble(
-                path_string=route_data[route_id]['intermediate_nodes'],
-                path_distance=route_data[route_id]['distance'],
-                end_node=route_data[route_id]['end_node'],
-                time_ok=on_time,
-                assaulted=was_assaulted,
-                connection_df=connection_df,
-                node_df=node_df
-            ))
-            has_complain, has_quit = self._update_stress_score(trouble_score)
-            # Create and store trip
-            simulated_trip =Trip(
-                route_id=route_id,
-                start_datetime=current_time,
-                completion_datetime=completion_time,
-                on_time=on_time,
-                min_completion_time=min_completion_time,
-                complain=complain,
-                assaulted=was_assaulted,
+
+        # Draw every per-trip random variable up front with one vectorized call each
+        route_indexes = self._rng.integers(len(self._assigned_routes_array), size=self.number_trips)
+        route_choices = self._assigned_routes_array[route_indexes] + 1
+        completion_uniforms = self._rng.uniform(size=self.number_trips)
+        completion_noises = self._rng.normal(0.95, 0.1, size=self.number_trips)
+        assault_reductions = self._rng.uniform(0.05, 0.20, size=self.number_trips)
+        inter_trip_hours = self._rng.exponential(1 / rate_hours, size=self.number_trips + 1)
+        # One row of per-connection assault draws per trip, wide enough for the longest assigned route
+        max_connections = max(len(assault_risks) for assault_risks, _ in self._route_cache.values())
+        edge_uniforms = self._rng.random((self.number_trips, max_connections))
+        assaults = self._simulate_assault(route_indexes=route_indexes, edge_draws=edge_uniforms)
+
+        # Per-trip route bounds, completion hours and on-time flags, vectorized over all trips
+        route_bounds = np.array([
+            (route_data[route + 1]['min_completion_time'], route_data[route + 1]['max_completion_time'])
+            for route in self._assigned_routes_array.tolist()
+        ], dtype=np.float64)
+        min_completion_times, max_completion_times = route_bounds[route_indexes].T
+        completion_hours = (min_completion_times + completion_uniforms *
+                            (max_completion_times - min_completion_times)) * completion_noises
+        on_times = (completion_hours <= max_completion_times) & ~assaults
+
+        # Timeline as int64 microseconds (datetime resolution), rounded per step like timedelta(hours=...)
+        trip_durations = np.rint(completion_hours * _US_PER_HOUR).astype(np.int64)
+        assault_savings = np.rint(completion_hours * assault_reductions * _US_PER_HOUR).astype(np.int64)
+        trip_durations -= np.where(assaults, assault_savings, 0)
+        waiting_times = np.rint(inter_trip_hours[:-1] * _US_PER_HOUR).astype(np.int64)
+        start_times = (np.datetime64(self.start_date, 'us').astype(np.int64) + np.cumsum(waiting_times) +
+                       np.concatenate(([0], np.cumsum(trip_durations[:-1]))))
+        start_datetimes = start_times.astype('datetime64[us]').tolist()
+        completion_datetimes = (start_times + trip_durations).astype('datetime64[us]').tolist()
+
+        trip_troubles = self._simulate_trouble(route_indexes=route_indexes, on_times=on_times, assaults=assaults)
+        trouble_scores, stress_scores, complains, self.stress_score, self.has_quit = _stress_recurrence(
+            trip_troubles, decay_factor, self.stress_score, self.stress_decay,
+            self.complain_threshold, self.quit_threshold
+        )
+
+        # Trips up to the one where the driver quits, built from the kernel outputs in one pass
+        number_simulated = len(trouble_scores)
+        for trip_index, trouble_score, stress_score, has_complain in zip(
+                range(number_simulated), trouble_scores.tolist(), stress_scores.tolist(), complains.tolist()):
+            has_quit = self.has_quit and trip_index == number_simulated - 1
+            simulated_trip = Trip(
+                route_id=int(route_choices[trip_index]),
+                start_datetime=start_datetimes[trip_index],
+                completion_datetime=completion_datetimes[trip_index],
+                on_time=bool(on_times[trip_index]),
+                min_completion_time=float(min_completion_times[trip_index]),
+                complain='',
+                assaulted=bool(assaults[trip_index]),
                 trouble_score=trouble_score,
-                stress_score=self.stress_score,
+                stress_score=stress_score,
                 has_complain=has_complain,
                 driver_quit=has_quit
             )
 
             if has_complain:
                 profile = DriverProfile(id=self.driver_id, age=self.age, years_experience=self.experience)
-                prompt = prompter.generate_prompt(
+                prompt = get_prompter().generate_prompt(
                     trip = simulated_trip,
                     driver = profile
                 )
-                complain = gpt_chat.chat_complete_with_model(
-                    system_role='system',
-                    system_content=driver_context,
-                    prompt=prompt
-                )
-                simulated_trip.complain = complain
+                # Requests are sent together once the simulation is done, see complete_complaints
+                self._pending_complaints.append((trip_index, prompt))
             trips.append(simulated_trip)
-            # Stop simulation if driver has quit
-            if has_quit:
-                break
-
-            # Calculate next trip start time
-            inter_trip_hours = np.random.exponential(1 / rate_hours)
-            current_time = completion_time + timedelta(hours=inter_trip_hours)
 
         return trips
 
     def _calculate_statistics(self):
-        """Calculate derived statistics from trips."""
+        """Calculate derived statistics from trips in a single pass."""
         self.number_routes = len(self.assigned_routes)
         self.number_trips = len(self.trips)
-
+        # Routes are stored 0-based in assigned_routes and 1-based in trips
+        self.route_list_csv = ','.join(map(str, (route + 1 for route in sorted(self.assigned_routes))))
+        self.most_common_topic = 1
+
+        trip_columns = trips_to_soa(self.trips)
+        route_ids = trip_columns['route_id']
+        self.trip_route_csv = ','.join(map(str, route_ids.tolist()))
+        self.number_complains = int(trip_columns['has_complain'].sum())
+        self.most_common_route = None
         if self.trips:
-            route_counts = {}
-            for trip in self.trips:
-                route_counts[trip.route_id + 1] = route_counts.get(trip.route_id + 1, 0) + 1
-            self.most_common_route = max(route_counts.items(), key=lambda x: x[1])[0]
\ No newline at end of file
+            counts = np.bincount(route_ids)
+            # Ties resolve to the route driven first, as Counter.most_common did
+            most_common = np.isin(route_ids, np.flatnonzero(counts == counts.max()))
+            self.most_common_route = int(route_ids[most_common.argmax()])
+
+
+def parse_route_edges(path_string: str) -> np.ndarray:
+    """
+    Parse a comma separated route path into its connections
+
+    Args:
+        path_string: Route nodes, e.g. '1,5,3'
+
+    Returns:
+        int32 array of shape (number of connections, 2) with (start_node, end_node) rows
+    """
+    nodes = np.array(path_string.split(','), dtype=np.int32)
+    return np.column_stack((nodes[:-1], nodes[1:]))
+
+
+def attach_route_edges(route_data: dict) -> dict:
+    """
+    Parse the path of every route once and store it under the 'edges' key, in place
+
+    Args:
+        route_data: Routes keyed by route_id, with intermediate_nodes
+
+    Returns:
+        The same route_data, for chaining
+    """
+    for route in route_data.values():
+        if 'edges' not in route:
+            route['edges'] = parse_route_edges(route['intermediate_nodes'])
+    return route_data
+
+
+# Read-only simulation inputs, sent once to each worker process by _init_worker
+_shared_inputs = {}
+
+
+def _init_worker(route_data: dict, node_df: pd.DataFrame, connection_df: pd.DataFrame):
+    # Lookup arrays are built once per process and shared by all its drivers
+    _shared_inputs.update(route_data=route_data, edge_tables=build_edge_tables(node_df, connection_df))
+
+
+def _simulate_one_driver(driver_id: int, seed: int, driver_kwargs: dict) -> DriverLife:
+    return DriverLife(driver_id=driver_id, seed=seed, **_shared_inputs, **driver_kwargs)
+
+
+def simulate_drivers(number_drivers: int,
+                     route_data: dict,
+                     node_df: pd.DataFrame,
+                     connection_df: pd.DataFrame,
+                     workers: Optional[int] = None,
+                     seed: Optional[int] = None,
+                     **driver_kwargs) -> List[DriverLife]:
+    """
+    Simulate independent drivers in parallel over a process pool
+
+    Args:
+        number_drivers: Number of drivers, with driver_id from 1 to number_drivers
+        route_data: Routes keyed by route_id
+        node_df: Nodes with node_id and node_difficult
+        connection_df: Connections between nodes with risk and highway data
+        workers: Number of worker processes (default uses every CPU, 1 simulates in-process)
+        seed: Optional seed from which an independent seed is spawned for every driver
+        **driver_kwargs: Further DriverLife arguments, e.g. number_locations
+
+    Returns:
+        List of simulated drivers ordered by driver_id
+
+    Example:
+        drivers = simulate_drivers(150, routes, node_df, connection_df, number_locations=32)
+    """
+    attach_route_edges(route_data)
+    generate_complaints = driver_kwargs.pop('generate_complaints', True)
+    driver_kwargs['generate_complaints'] = False
+    driver_ids = range(1, number_drivers + 1)
+    # Seeds do not depend on the worker count, so results are reproducible for any pool size
+    seeds = [int(driver_seed) for driver_seed in np.random.SeedSequence(seed).generate_state(number_drivers)]
+
+    if workers == 1:
+        _init_worker(route_data, node_df, connection_df)
+        drivers = [_simulate_one_driver(driver_id, driver_seed, driver_kwargs)
+                   for driver_id, driver_seed in zip(driver_ids, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(route_data, node_df, connection_df)) as executor:
+            drivers = list(executor.map(_simulate_one_driver, driver_ids, seeds,
+                                        [driver_kwargs] * number_drivers))
+
+    # Complaints of the whole fleet are requested together from the parent process
+    if generate_complaints:
+        complete_complaints(drivers)
+    return drivers
+
+
+def complete_complaints(drivers: List[DriverLife], max_concurrency: int = 10) -> None:
+    """
+    Request the pending complaint messages of several drivers with concurrent OpenAI calls
+
+    Args:
+        drivers: Simulated drivers, complaints are written into their trips
+        max_concurrency: Maximum number of requests in flight at the same time
+    """
+    pending = [(driver, trip_index, prompt)
+               for driver in drivers for trip_index, prompt in driver._pending_complaints]
+    if not pending:
+        return
+
+    complaints = _run_coroutine(get_chat().chat_complete_many_async(
+        system_role='system',
+        system_content=driver_context,
+        prompts=[prompt for _, _, prompt in pending],
+        max_concurrency=max_concurrency
+    ))
+    for (driver, trip_index, _), complain in zip(pending, complaints):
+        driver.trips[trip_index].complain = complain
+    for driver in drivers:
+        driver._pending_complaints = []
+
+
+def _run_coroutine(coroutine: Coroutine):
+    """Run a coroutine to completion, on a helper thread when an event loop is already running (e.g. Jupyter)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
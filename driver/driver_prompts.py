@@ -11,6 +11,21 @@ class ComplaintTopic(Enum):
 
 class PromptGenerator:
     """Generates complaint messages using OpenAI based on trip data and driver profile"""
+    _TEMPLATE = """Assume you are a trailer driver with the following profile:
+- Age: {age}
+- Years of experience: {years_experience}
+
+You just completed route {route_id} and need to file a complaint about the {topic} department.
+Write a detailed complaint message describing issues you encountered. The trip took {duration_hours} hours.
+
+Additional context:
+- Was the delivery on time? {on_time}
+- Did you experience any assault? {assaulted}
+- Stress level during trip: {stress_level}/10
+- Overall trouble score: {trouble_level}/10
+
+Write a one paragraph complaint in first person perspective, be specific about the issues in a short paragraph. Informal language is acceptable. Just write the body of the complain message."""
+
     def __init__(self):
         self._topic_weights = {
             ComplaintTopic.OPERATIONS: 0.5,
@@ -26,17 +41,14 @@ class PromptGenerator:
     def generate_prompt(self, trip: Trip, driver: DriverProfile) -> str:
         """Generate the prompt for OpenAI based on trip and driver data"""
         topic = self._select_topic()
-        return f"""Assume you are a trailer driver with the following profile:
-- Age: {driver.age}
-- Years of experience: {driver.years_experience}
-
-You just completed route {trip.route_id} and need to file a complaint about the {topic.value} department.
-Write a detailed complaint message describing issues you encountered. The trip took {(trip.completion_datetime - trip.start_datetime).total_seconds() / 3600} hours.
-
-Additional context:
-- Was the delivery on time? {"Yes" if trip.on_time else "No"}
-- Did you experience any assault? {"Yes" if trip.assaulted else "No"}
-- Stress level during trip: {trip.stress_score*10}/10
-- Overall trouble score: {trip.trouble_score*10}/10
-
-Write a one paragraph complaint in first person perspective, be specific about the issues in a short paragraph. Informal language is acceptable. Just write the body of the complain message."""
+        return self._TEMPLATE.format_map({
+            'age': driver.age,
+            'years_experience': driver.years_experience,
+            'route_id': trip.route_id,
+            'topic': topic.value,
+            'duration_hours': (trip.completion_datetime - trip.start_datetime).total_seconds() / 3600,
+            'on_time': "Yes" if trip.on_time else "No",
+            'assaulted': "Yes" if trip.assaulted else "No",
+            'stress_level': trip.stress_score*10,
+            'trouble_level': trip.trouble_score*10
+        })
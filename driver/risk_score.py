@@ -1,38 +1,120 @@
 import numpy as np
-from dataclasses import dataclass
+from typing import Final
+from numba import njit
 from models.db_models import HighwayClassification, HighwayCondition, HighwayDifficult, UnloadingDifficult
 
-@dataclass
-class RiskFactors:
-    # Base risk scores for highway classification (0-1 scale)
-    HIGHWAY_CLASS_RISK = {
-        HighwayClassification.HIGHWAY: 0.2,  # Most controlled, lowest risk
-        HighwayClassification.FREEWAY: 0.3,
-        HighwayClassification.LOCAL: 0.6,  # More intersections, higher risk
-        HighwayClassification.RURAL: 0.8  # Least controlled, highest risk
-    }
-
-    # Condition multipliers
-    HIGHWAY_CONDITION_MULT = {
-        HighwayCondition.EXCELLENT: 0.7,
-        HighwayCondition.GOOD: 1.0,
-        HighwayCondition.FAIR: 1.3,
-        HighwayCondition.POOR: 1.8
-    }
-
-    # Difficulty multipliers
-    HIGHWAY_DIFFICULTY_MULT = {
-        HighwayDifficult.EASY: 0.8,
-        HighwayDifficult.NORMAL: 1.0,
-        HighwayDifficult.HARD: 1.5
-    }
-
-    # Unloading difficulty multipliers
-    UNLOADING_DIFFICULTY_MULT = {
-        UnloadingDifficult.EASY: 0.8,
-        UnloadingDifficult.NORMAL: 1.0,
-        UnloadingDifficult.HARD: 1.4
-    }
+# Base risk score scaled by every other factor
+BASE_RISK: Final = 0.1
+
+# Base risk scores for highway classification (0-1 scale)
+HIGHWAY_CLASS_RISK: Final = {
+    HighwayClassification.HIGHWAY: 0.2,  # Most controlled, lowest risk
+    HighwayClassification.FREEWAY: 0.3,
+    HighwayClassification.LOCAL: 0.6,  # More intersections, higher risk
+    HighwayClassification.RURAL: 0.8  # Least controlled, highest risk
+}
+
+# Condition multipliers
+HIGHWAY_CONDITION_MULT: Final = {
+    HighwayCondition.EXCELLENT: 0.7,
+    HighwayCondition.GOOD: 1.0,
+    HighwayCondition.FAIR: 1.3,
+    HighwayCondition.POOR: 1.8
+}
+
+# Difficulty multipliers
+HIGHWAY_DIFFICULTY_MULT: Final = {
+    HighwayDifficult.EASY: 0.8,
+    HighwayDifficult.NORMAL: 1.0,
+    HighwayDifficult.HARD: 1.5
+}
+
+# Unloading difficulty multipliers
+UNLOADING_DIFFICULTY_MULT: Final = {
+    UnloadingDifficult.EASY: 0.8,
+    UnloadingDifficult.NORMAL: 1.0,
+    UnloadingDifficult.HARD: 1.4
+}
+
+# Integer code of each enum member and factor arrays indexed by those codes, for the jitted kernel.
+# Scores are clamped to [0, 1] and only compared against thresholds, so float32 is precise enough
+CLASS_CODES = {member: code for code, member in enumerate(HighwayClassification)}
+CONDITION_CODES = {member: code for code, member in enumerate(HighwayCondition)}
+DIFFICULTY_CODES = {member: code for code, member in enumerate(HighwayDifficult)}
+UNLOADING_CODES = {member: code for code, member in enumerate(UnloadingDifficult)}
+
+_CLASS_RISK = np.array([HIGHWAY_CLASS_RISK[member] for member in HighwayClassification], dtype=np.float32)
+_CONDITION_MULT = np.array([HIGHWAY_CONDITION_MULT[member] for member in HighwayCondition], dtype=np.float32)
+_DIFFICULTY_MULT = np.array([HIGHWAY_DIFFICULTY_MULT[member] for member in HighwayDifficult], dtype=np.float32)
+_UNLOADING_MULT = np.array([UNLOADING_DIFFICULTY_MULT[member] for member in UnloadingDifficult], dtype=np.float32)
+
+
+@njit(cache=True, fastmath=True)
+def trouble_score_from_codes(
+        class_code: int,
+        condition_code: int,
+        difficulty_code: int,
+        unloading_code: int,
+        driver_experience: float,
+        distance: float,
+        omit_unloading: bool,
+        base_risk: float
+) -> float:
+    """
+    Trouble score from the integer codes in CLASS_CODES, CONDITION_CODES, DIFFICULTY_CODES
+    and UNLOADING_CODES, computed in float32; see calculate_trouble_score
+    """
+    one = np.float32(1.0)
+    unloading_factor = one if omit_unloading else _UNLOADING_MULT[unloading_code]
+    experience_factor = np.exp(np.float32(-0.1) * np.float32(driver_experience))
+    distance_factor = one + np.log1p(np.float32(distance) / np.float32(1000.0))
+    final_score = (np.float32(base_risk) * _CLASS_RISK[class_code] * _CONDITION_MULT[condition_code] *
+                   _DIFFICULTY_MULT[difficulty_code] * unloading_factor * experience_factor * distance_factor)
+    return min(one, max(np.float32(0.0), final_score))
+
+
+@njit(cache=True, fastmath=True)
+def route_trouble_score(
+        edge_codes: np.ndarray,
+        unloading_codes: np.ndarray,
+        first_unloading_edge: int,
+        driver_experience: float,
+        distance: float,
+        base_risk: float
+) -> float:
+    """
+    Sum of the trouble scores of the connections of a route, see trouble_score_from_codes
+
+    Args:
+        edge_codes: (connections, 3) class, condition and difficulty codes of each connection
+        unloading_codes: Unloading code of the end node of each connection
+        first_unloading_edge: First connection reaching the route's end node; connections before it omit unloading
+        driver_experience: Years of experience (used for risk reduction)
+        distance: Route distance in km
+        base_risk: Base risk score
+
+    Returns:
+        Float with the summed trouble score of the route
+    """
+    one = np.float32(1.0)
+    zero = np.float32(0.0)
+    # Experience and distance factors are the same for every connection of the route
+    experience_factor = np.exp(np.float32(-0.1) * np.float32(driver_experience))
+    distance_factor = one + np.log1p(np.float32(distance) / np.float32(1000.0))
+
+    total = 0.0
+    # Interior connections: the unloading factor is 1, so it is skipped
+    for i in range(first_unloading_edge):
+        score = (np.float32(base_risk) * _CLASS_RISK[edge_codes[i, 0]] * _CONDITION_MULT[edge_codes[i, 1]] *
+                 _DIFFICULTY_MULT[edge_codes[i, 2]] * experience_factor * distance_factor)
+        total += min(one, max(zero, score))
+    # Connections from the end node on include the unloading difficulty
+    for i in range(first_unloading_edge, edge_codes.shape[0]):
+        score = (np.float32(base_risk) * _CLASS_RISK[edge_codes[i, 0]] * _CONDITION_MULT[edge_codes[i, 1]] *
+                 _DIFFICULTY_MULT[edge_codes[i, 2]] * _UNLOADING_MULT[unloading_codes[i]] *
+                 experience_factor * distance_factor)
+        total += min(one, max(zero, score))
+    return total
 
 
 def calculate_trouble_score(
@@ -43,11 +125,15 @@ def calculate_trouble_score(
         driver_experience: float,
         distance: float,
         omit_unloading: bool = False,
-        base_risk: float = 0.1
+        base_risk: float = BASE_RISK
 ) -> float:
     """
     Calculate the trouble score for a trip based on various risk factors.
 
+    The score is the base risk scaled by the highway classification, condition and
+    difficulty, the unloading difficulty, an experience reduction exp(-0.1 * experience)
+    and a distance factor 1 + log1p(distance / 1000), computed by a Numba kernel.
+
     Args:
         highway_class: Classification of the highway
         highway_condition: Condition of the highway
@@ -61,30 +147,13 @@ def calculate_trouble_score(
     Returns:
         Float between 0 and 1 representing the trouble score
     """
-    risk_factors = RiskFactors()
-
-    # Calculate base risk from highway classification
-    base_class_risk = risk_factors.HIGHWAY_CLASS_RISK[highway_class]
-
-    # Apply condition multiplier
-    condition_adjusted = base_class_risk * risk_factors.HIGHWAY_CONDITION_MULT[highway_condition]
-
-    # Apply difficulty multipliers
-    unloading_factor = 1.0 if omit_unloading else risk_factors.UNLOADING_DIFFICULTY_MULT[unloading_difficulty]
-    difficulty_adjusted = condition_adjusted * (
-            risk_factors.HIGHWAY_DIFFICULTY_MULT[highway_difficulty] *
-            unloading_factor
+    return trouble_score_from_codes(
+        CLASS_CODES[highway_class],
+        CONDITION_CODES[highway_condition],
+        DIFFICULTY_CODES[highway_difficulty],
+        UNLOADING_CODES[unloading_difficulty],
+        float(driver_experience),
+        float(distance),
+        bool(omit_unloading),
+        float(base_risk)
     )
-
-    # Experience reduction factor (exponential decay)
-    # More experienced drivers have lower risk, but with diminishing returns
-    experience_factor = np.exp(-0.1 * driver_experience)  # Reduces risk up to ~63% for very experienced drivers
-
-    # Distance factor (longer trips have higher risk)
-    distance_factor = 1 + np.log1p(distance / 1000)
-
-    # Combine all factors
-    final_score = base_risk * difficulty_adjusted * experience_factor * distance_factor
-
-    # Ensure score is between 0 and 1
-    return min(1.0, max(0.0, final_score))
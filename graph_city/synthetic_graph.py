@@ -1,8 +1,11 @@
 import random
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 
-from typing import Optional
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from typing import List, Optional, Sequence, Tuple
 from logger.logger import logger
 from models.route_info import RouteInfo
 from models.constants import KM_PRICE
@@ -33,10 +36,47 @@ class SyntheticGraph:
         self._simple_edges = list()
         self.graph = nx.DiGraph()
 
+        # Edges and weights come from a NumPy generator, route sampling from the random module
+        self._rng = np.random.default_rng(random_seed)
         if random_seed is not None:
             random.seed(random_seed)
 
         self._create_graph()
+        self._build_lookups()
+
+    def __setstate__(self, state):
+        """Restore the graph and rebuild the node lookups, which older pickles do not have."""
+        self.__dict__.update(state)
+        self._build_lookups()
+
+    def _build_lookups(self) -> None:
+        """
+            Procedure to index the nodes of the finished graph for the shortest path queries
+
+            Notes:
+                - Node order and node -> position map are shared by every query.
+                - CSR adjacency matrices are built on first use, one per weight.
+        """
+        self._nodes = list(self.graph.nodes)
+        self._position = {node: i for i, node in enumerate(self._nodes)}
+        self._adjacency = {}
+
+    def _adjacency_matrix(self, weight: str) -> csr_matrix:
+        """
+        CSR adjacency matrix of the graph weighted by distance or price, built once per weight
+
+        Args:
+            weight: Edge attribute used as weight ("distance" or "price")
+
+        Returns:
+            csr_matrix indexed by node position
+        """
+        if weight not in self._adjacency:
+            sources, targets, weights = zip(*((self._position[u], self._position[v], data[weight])
+                                              for u, v, data in self.graph.edges(data=True)))
+            self._adjacency[weight] = csr_matrix((weights, (sources, targets)),
+                                                 shape=(len(self._nodes), len(self._nodes)))
+        return self._adjacency[weight]
 
     @property
     def graph_edges(self):
@@ -75,10 +115,11 @@ class SyntheticGraph:
             logger.error("Graph Error: Node range is out of scope")
             raise ValueError("Graph Error: Node range is out of scope")
 
-        spanning_edges = [(i, (i + 1) % self.num_nodes) for i in node_list]
-        for u, v in spanning_edges:
+        us = np.array(node_list)
+        vs = (us + 1) % self.num_nodes
+        for u, v in zip(us.tolist(), vs.tolist()):
             self._simple_edges.extend([(u,v), (v,u)])
-            self._add_bidirectional_edge(u, v)
+        self.graph.add_edges_from(self._bidirectional_edges(us, vs))
 
     def _add_random_edges(self, nodes: range, density_param: int = 2) -> None:
         """
@@ -88,34 +129,47 @@ class SyntheticGraph:
                 nodes: Range of numbers of nodes to connect in a random way.
                 density_param: Parameter to control density. Higher value involves higher density (default: 2)
         """
-        for _ in range(self.num_nodes * density_param):
-            u, v = random.sample(list(nodes), 2)
+        node_array = np.asarray(nodes)
+        number_edges = self.num_nodes * density_param
+
+        # A non-zero offset modulo the number of nodes picks a uniform second node other than the first
+        sources = self._rng.integers(len(node_array), size=number_edges)
+        offsets = self._rng.integers(1, len(node_array), size=number_edges)
+        us = node_array[sources]
+        vs = node_array[(sources + offsets) % len(node_array)]
+
+        for u, v in zip(us.tolist(), vs.tolist()):
             self._random_edges.extend([(u,v), (v,u)])
-            self._add_bidirectional_edge(u, v)
+        self.graph.add_edges_from(self._bidirectional_edges(us, vs))
 
-    def _add_bidirectional_edge(self, u: int, v: int) -> None:
+    def _bidirectional_edges(self, us: np.ndarray, vs: np.ndarray) -> list:
         """
-        Add a bidirectional edge between two nodes with random weights
+        Build both directions of edges between pairs of nodes with random weights
 
         Args:
-            u: Source node
-            v: Target node
+            us: Source nodes
+            vs: Target nodes
+
+        Returns:
+            List of (source, target, data) tuples ready for add_edges_from, forward edge first
         """
         # Forward edge data
         # Random distance, price is directly proportional to distance
-        distance = random.randint(300, 1000)
-        price = distance * KM_PRICE
-
-        # Forward edge
-        self.graph.add_edge(u, v,
-                            distance=distance,
-                            price=price)
+        distances = self._rng.integers(300, 1001, size=len(us))
+        prices = distances * KM_PRICE
 
         # Reverse edge with different data
         # Distance might be different, price also can be different
-        self.graph.add_edge(v, u,
-                            distance=distance + random.randint(-10, 10),
-                            price=price + random.randint(-1, 1))
+        reverse_distances = distances + self._rng.integers(-10, 11, size=len(us))
+        reverse_prices = prices + self._rng.integers(-1, 2, size=len(us))
+
+        edges = []
+        for u, v, distance, price, reverse_distance, reverse_price in zip(
+                us.tolist(), vs.tolist(), distances.tolist(), prices.tolist(),
+                reverse_distances.tolist(), reverse_prices.tolist()):
+            edges.append((u, v, dict(distance=distance, price=price)))
+            edges.append((v, u, dict(distance=reverse_distance, price=reverse_price)))
+        return edges
 
     def get_random_route(self) -> Optional[RouteInfo]:
         """
@@ -124,18 +178,34 @@ class SyntheticGraph:
         Returns:
             RouteInfo object containing route details or None if no route is found
         """
-        nodes = list(self.graph.nodes)
-        start = random.choice(nodes)
+        return self.get_random_routes(number_routes=1)[0]
 
-        reachable_nodes = list(nx.descendants(self.graph, start))
-        if not reachable_nodes:
-            return None
+    def get_random_routes(self, number_routes: int, weight: str = "distance") -> List[Optional[RouteInfo]]:
+        """
+        Generate random routes with a single batched shortest path computation.
 
-        end = random.choice(reachable_nodes)
-        try:
-            return self.get_path_info(start, end)
-        except nx.NetworkXNoPath:
-            return None
+        Args:
+            number_routes: Number of routes to generate
+            weight: Weight to use for shortest path calculation ("distance" or "price")
+
+        Returns:
+            List of RouteInfo objects, None where the start node reaches no other node
+        """
+        starts = [random.choice(self._nodes) for _ in range(number_routes)]
+        distances, predecessors, node_index = self._shortest_paths(starts, weight)
+
+        routes = []
+        for start in starts:
+            row = node_index[start]
+            reachable_nodes = [self._nodes[i] for i in np.flatnonzero(np.isfinite(distances[row])).tolist()
+                               if self._nodes[i] != start]
+            if not reachable_nodes:
+                routes.append(None)
+                continue
+
+            end = random.choice(reachable_nodes)
+            routes.append(self._route_from_predecessors(start, end, predecessors[row]))
+        return routes
 
     def get_path_info(self, start: int, end: int, weight: str = "distance") -> Optional[RouteInfo]:
         """
@@ -153,26 +223,94 @@ class SyntheticGraph:
             ValueError: If weight is not "distance" or "price"
             ValueError: If start or end nodes don't exist in graph
         """
+        return self.get_path_infos([start], [end], weight=weight)[0]
+
+    def get_path_infos(self, starts: Sequence[int], ends: Sequence[int],
+                       weight: str = "distance") -> List[Optional[RouteInfo]]:
+        """
+        Get information about the shortest paths between pairs of nodes.
+        Dijkstra runs once per distinct start node over a CSR adjacency matrix.
+
+        Args:
+            starts: Starting node of each path
+            ends: Ending node of each path
+            weight: Weight to use for shortest path calculation ("distance" or "price")
+
+        Returns:
+            List of RouteInfo objects, None where no path exists
+
+        Raises:
+            ValueError: If weight is not "distance" or "price"
+            ValueError: If start or end nodes don't exist in graph
+        """
+        if any(start not in self.graph.nodes for start in starts) or \
+                any(end not in self.graph.nodes for end in ends):
+            raise ValueError("Start and end nodes must exist in the graph")
+
+        _, predecessors, node_index = self._shortest_paths(starts, weight)
+        return [
+            self._route_from_predecessors(start, end, predecessors[node_index[start]])
+            for start, end in zip(starts, ends)
+        ]
+
+    def _shortest_paths(self, starts: Sequence[int], weight: str) -> Tuple[np.ndarray, np.ndarray, dict]:
+        """
+        Run Dijkstra from every distinct start node.
+
+        Args:
+            starts: Starting nodes, repeated nodes are solved once
+            weight: Weight to use for shortest path calculation ("distance" or "price")
+
+        Returns:
+            Tuple of (distance matrix, predecessor matrix, start node -> row)
+
+        Raises:
+            ValueError: If weight is not "distance" or "price"
+        """
         if weight not in ["distance", "price"]:
             raise ValueError('Weight must be either "distance" or "price"')
 
-        if start not in self.graph.nodes or end not in self.graph.nodes:
-            raise ValueError("Start and end nodes must exist in the graph")
+        unique_starts = list(dict.fromkeys(starts))
+        distances, predecessors = dijkstra(self._adjacency_matrix(weight), directed=True,
+                                           indices=[self._position[start] for start in unique_starts],
+                                           return_predecessors=True)
+        return distances, predecessors, {start: row for row, start in enumerate(unique_starts)}
+
+    def _route_from_predecessors(self, start: int, end: int, predecessors: np.ndarray) -> Optional[RouteInfo]:
+        """
+        Walk the Dijkstra predecessor row of start back from end and build the route
 
-        try:
-            path = nx.shortest_path(self.graph, source=start, target=end, weight=weight)
-            total_distance = sum(self.graph[u][v]["distance"] for u, v in zip(path, path[1:]))
-            total_price = sum(self.graph[u][v]["price"] for u, v in zip(path, path[1:]))
-
-            return RouteInfo(
-                start=start,
-                end=end,
-                path=path,
-                total_distance=total_distance,
-                total_price=total_price
-            )
-        except nx.NetworkXNoPath:
-            return None
+        Args:
+            start: Starting node
+            end: Ending node
+            predecessors: Predecessor positions (in graph node order) of the shortest paths from start
+
+        Returns:
+            RouteInfo object containing path details or None if end is unreachable
+        """
+        current = self._position[end]
+        path = [end]
+        while path[-1] != start:
+            current = predecessors[current]
+            if current < 0:
+                return None
+            path.append(self._nodes[current])
+        path.reverse()
+
+        total_distance = sum(self.graph[u][v]["distance"] for u, v in zip(path, path[1:]))
+        total_price = sum(self.graph[u][v]["price"] for u, v in zip(path, path[1:]))
+
+        # RouteInfo is frozen and hashed by its path, so the array is read-only as well
+        path_array = np.fromiter(path, dtype=np.int32, count=len(path))
+        path_array.setflags(write=False)
+
+        return RouteInfo(
+            start=start,
+            end=end,
+            path=path_array,
+            total_distance=total_distance,
+            total_price=total_price
+        )
 
     def visualize(self, save_path: Optional[str] = None) -> None:
         """
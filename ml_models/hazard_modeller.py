@@ -33,11 +33,11 @@ class DriverSurvivalAnalyzer:
             'time_since_last_trip'
         ]
 
-        for var in continuous_vars:
-            if var in survival_data.columns:
-                mean = survival_data[var].mean()
-                std = survival_data[var].std()
-                survival_data[var] = (survival_data[var] - mean) / std
+        # One broadcast over every present column instead of a column-by-column update, skipping NaN as pandas does
+        columns = [var for var in continuous_vars if var in survival_data.columns]
+        if columns:
+            values = survival_data[columns].to_numpy(dtype=np.float64)
+            survival_data[columns] = (values - np.nanmean(values, axis=0)) / np.nanstd(values, axis=0, ddof=1)
 
         return survival_data
 
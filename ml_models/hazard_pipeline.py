@@ -1,4 +1,142 @@
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from typing import Tuple
+from numba import njit
+from pyarrow import csv
+
+_NS_PER_DAY = 60 * 60 * 24 * 10 ** 9
+
+# Columns read from each CSV, with the type Arrow parses them to
+# Dictionary encoded columns arrive in pandas as categoricals
+DRIVER_COLUMNS = {'driver_id': pa.int64(), 'experience': pa.int64(), 'age': pa.int64(),
+                  'sex': pa.dictionary(pa.int32(), pa.string()), 'status': pa.dictionary(pa.int32(), pa.string())}
+TRIP_COLUMNS = {'driver_id': pa.int64(), 'start_datetime': pa.timestamp('ns'),
+                'end_datetime': pa.timestamp('ns')}
+COMPLAINT_COLUMNS = {'driver_id': pa.int64(), 'complain_datetime': pa.timestamp('ns'),
+                     'predicted_topic': pa.int64()}
+
+
+@njit(cache=True)
+def mean_gap_days(group_codes: np.ndarray, times_ns: np.ndarray, number_groups: int) -> np.ndarray:
+    """
+    Mean gap in days between consecutive events of each group, in a single pass
+
+    Args:
+        group_codes: Factorized group of each event, sorted
+        times_ns: Event timestamps in nanoseconds, sorted inside each group
+        number_groups: Number of distinct group codes
+
+    Returns:
+        Array with the mean gap of each group code, NaN for groups with fewer than 2 events
+    """
+    prev_time = np.zeros(number_groups, dtype=np.int64)
+    sum_gap = np.zeros(number_groups, dtype=np.float64)
+    count = np.zeros(number_groups, dtype=np.int64)
+
+    for i in range(group_codes.shape[0]):
+        group = group_codes[i]
+        if count[group] > 0:
+            sum_gap[group] += times_ns[i] - prev_time[group]
+        prev_time[group] = times_ns[i]
+        count[group] += 1
+
+    mean_gaps = np.full(number_groups, np.nan)
+    for group in range(number_groups):
+        if count[group] > 1:
+            mean_gaps[group] = sum_gap[group] / (count[group] - 1) / _NS_PER_DAY
+    return mean_gaps
+
+
+def _read_columns(path: str, column_types: dict) -> pd.DataFrame:
+    """
+    Read only the given columns of a '|' separated CSV with the multithreaded Arrow reader
+
+    Args:
+        path: Path to the CSV file
+        column_types: Column name -> Arrow type, timestamps are parsed while reading
+
+    Returns:
+        NumPy-backed DataFrame with the given columns
+    """
+    table = csv.read_csv(
+        path,
+        # Complaint comments are free text and may hold quoted line breaks
+        parse_options=csv.ParseOptions(delimiter='|', newlines_in_values=True),
+        convert_options=csv.ConvertOptions(include_columns=list(column_types), column_types=column_types)
+    )
+    return table.to_pandas()
+
+
+def _group_events_by_driver(
+        driver_ids: np.ndarray,
+        times_ns: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sort events by driver and time into contiguous per-driver segments
+
+    Args:
+        driver_ids: Driver of each event
+        times_ns: Event timestamps in nanoseconds
+
+    Returns:
+        Tuple of (sorting order of the events, driver of each segment, segment starts, segment lengths)
+    """
+    order = np.lexsort((times_ns, driver_ids))
+    sorted_ids = driver_ids[order]
+    # A segment starts at the first event and wherever the driver changes
+    starts = np.flatnonzero(np.diff(sorted_ids, prepend=sorted_ids[:1] - 1))
+    counts = np.diff(np.append(starts, len(sorted_ids)))
+    return order, sorted_ids[starts], starts, counts
+
+
+def _mean_gaps(sorted_times_ns: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Mean gap in days inside each segment of sorted timestamps, see mean_gap_days
+
+    Args:
+        sorted_times_ns: Timestamps in nanoseconds sorted by segment and time
+        counts: Length of each segment
+
+    Returns:
+        Array with the mean gap of each segment, NaN for segments with fewer than 2 events
+    """
+    codes = np.repeat(np.arange(len(counts)), counts)
+    return mean_gap_days(codes, sorted_times_ns, len(counts))
+
+
+def _most_common_by_driver(driver_ids: np.ndarray, values: np.ndarray) -> pd.Series:
+    """
+    Most common value of each driver, ties resolve to the smallest value like mode().iloc[0]
+
+    Args:
+        driver_ids: Driver of each event
+        values: Value of each event, missing values are skipped
+
+    Returns:
+        Series with the most common value, indexed by driver_id
+    """
+    present = pd.notna(values)
+    driver_ids, values = driver_ids[present], values[present]
+
+    # Runs of equal (driver, value) pairs after sorting by driver and value
+    order = np.lexsort((values, driver_ids))
+    sorted_ids, sorted_values = driver_ids[order], values[order]
+    run_starts = np.flatnonzero((np.diff(sorted_ids, prepend=sorted_ids[:1] - 1) != 0) |
+                                (np.diff(sorted_values, prepend=sorted_values[:1] - 1) != 0))
+    run_counts = np.diff(np.append(run_starts, len(sorted_ids)))
+    run_ids, run_values = sorted_ids[run_starts], sorted_values[run_starts]
+
+    # Longest run of each driver first, the smallest value first among equally long runs
+    best = np.lexsort((run_values, -run_counts, run_ids))
+    run_ids, run_values = run_ids[best], run_values[best]
+    first = np.flatnonzero(np.diff(run_ids, prepend=run_ids[:1] - 1))
+    return pd.Series(run_values[first], index=run_ids[first])
+
+
+def _as_ns(column: pd.Series) -> np.ndarray:
+    return column.to_numpy(dtype='datetime64[ns]').view('i8')
+
 
 def build_survival_dataset(
         drivers_file: str,
@@ -18,15 +156,10 @@ def build_survival_dataset(
     Returns:
         DataFrame with features for survival analysis
     """
-    # Load data
-    drivers_df = pd.read_csv(drivers_file, sep='|')
-    trips_df = pd.read_csv(trips_file, sep='|')
-    complaints_df = pd.read_csv(complaints_file, sep='|')
-
-    # Convert datetime columns
-    trips_df['start_datetime'] = pd.to_datetime(trips_df['start_datetime'])
-    trips_df['end_datetime'] = pd.to_datetime(trips_df['end_datetime'])
-    complaints_df['complain_datetime'] = pd.to_datetime(complaints_df['complain_datetime'])
+    # Load data, datetime columns are converted while reading
+    drivers_df = _read_columns(drivers_file, DRIVER_COLUMNS)
+    trips_df = _read_columns(trips_file, TRIP_COLUMNS)
+    complaints_df = _read_columns(complaints_file, COMPLAINT_COLUMNS)
     reference_date = pd.to_datetime(reference_date)
 
     # Initialize result DataFrame with basic driver features
@@ -35,54 +168,40 @@ def build_survival_dataset(
     # Add quit indicator
     result_df['has_quit'] = (drivers_df['status'] == 'quit').astype(int)
 
-    # Calculate number of complaints per driver
-    complaint_counts = complaints_df.groupby('driver_id').size()
-    result_df['number_of_complaints'] = result_df['driver_id'].map(complaint_counts).fillna(0)
-
-    # Calculate average inter-complaint time
-    def calculate_inter_complaint_time(group):
-        if len(group) < 2:
-            return pd.NA
-        sorted_times = group['complain_datetime'].sort_values()
-        time_diffs = sorted_times.diff()
-        return time_diffs.mean().total_seconds() / (60 * 60 * 24)  # Convert to days
-
-    inter_complaint_times = complaints_df.groupby('driver_id').apply(calculate_inter_complaint_time)
-    result_df['avg_inter_complaint_time'] = result_df['driver_id'].map(inter_complaint_times)
-
-    # Calculate average inter-trip time
-    def calculate_inter_trip_time(group):
-        if len(group) < 2:
-            return pd.NA
-        sorted_times = group['start_datetime'].sort_values()
-        time_diffs = sorted_times.diff()
-        return time_diffs.mean().total_seconds() / (60 * 60 * 24)  # Convert to days
-
-    inter_trip_times = trips_df.groupby('driver_id').apply(calculate_inter_trip_time)
-    result_df['avg_inter_trip_time'] = result_df['driver_id'].map(inter_trip_times)
+    # Per-driver complaint features over contiguous per-driver segments
+    complaint_times = _as_ns(complaints_df['complain_datetime'])
+    order, complaint_drivers, _, complaint_counts = _group_events_by_driver(
+        complaints_df['driver_id'].to_numpy(), complaint_times)
+    complaint_aggs = pd.DataFrame({
+        'number_of_complaints': complaint_counts,
+        # Drivers with a single complaint get NaN
+        'avg_inter_complaint_time': _mean_gaps(complaint_times[order], complaint_counts)
+    }, index=complaint_drivers)
+    complaint_aggs['most_common_complaint_topic'] = _most_common_by_driver(
+        complaints_df['driver_id'].to_numpy(), complaints_df['predicted_topic'].to_numpy())
+
+    # Per-driver trip features, NaT end times are the smallest int64 and never win the maximum
+    trip_times = _as_ns(trips_df['start_datetime'])
+    order, trip_drivers, trip_starts, trip_counts = _group_events_by_driver(
+        trips_df['driver_id'].to_numpy(), trip_times)
+    end_times = _as_ns(trips_df['end_datetime'])[order]
+    last_trip_times = np.maximum.reduceat(end_times, trip_starts) if len(trip_starts) else end_times
+    trip_aggs = pd.DataFrame({
+        'last_trip_datetime': last_trip_times.view('datetime64[ns]'),
+        'avg_inter_trip_time': _mean_gaps(trip_times[order], trip_counts)
+    }, index=trip_drivers)
+
+    # Join every feature on driver_id at once
+    aggs = pd.concat([complaint_aggs, trip_aggs], axis=1)
+    result_df = result_df.set_index('driver_id').join(aggs).reset_index()
+    result_df['number_of_complaints'] = result_df['number_of_complaints'].fillna(0)
 
     # Calculate time since last trip
-    def get_last_trip_time(group):
-        if len(group) == 0:
-            return pd.NA
-        return group['end_datetime'].max()
-
-    last_trip_times = trips_df.groupby('driver_id').apply(get_last_trip_time)
-    result_df['last_trip_datetime'] = result_df['driver_id'].map(last_trip_times)
     result_df['time_since_last_trip'] = (
-            (pd.to_datetime(result_df['last_trip_datetime']) - reference_date)
+            (result_df['last_trip_datetime'] - reference_date)
             .dt.total_seconds() / (60 * 60 * 24)  # Convert to days
     )
 
-    # Get most common complaint topic
-    def get_most_common_topic(group):
-        if len(group) == 0:
-            return pd.NA
-        return group['predicted_topic'].mode().iloc[0]
-
-    most_common_topics = complaints_df.groupby('driver_id').apply(get_most_common_topic)
-    result_df['most_common_complaint_topic'] = result_df['driver_id'].map(most_common_topics)
-
     # Clean up the dataset
     # Fill NA values with appropriate defaults
     result_df['avg_inter_complaint_time'] = result_df['avg_inter_complaint_time'].fillna(0)
@@ -90,4 +209,8 @@ def build_survival_dataset(
     result_df['time_since_last_trip'] = result_df['time_since_last_trip'].fillna(0)
     result_df['most_common_complaint_topic'] = result_df['most_common_complaint_topic'].fillna(-1)
 
-    return result_df
+    return result_df[[
+        'driver_id', 'experience', 'age', 'sex', 'has_quit', 'number_of_complaints',
+        'avg_inter_complaint_time', 'avg_inter_trip_time', 'last_trip_datetime',
+        'time_since_last_trip', 'most_common_complaint_topic'
+    ]]
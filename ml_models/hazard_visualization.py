@@ -1,14 +1,44 @@
+import os
+import pickle
+import hashlib
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from typing import Dict, List, Optional, Tuple
 from lifelines import KaplanMeierFitter
 
+# Numerical features shared by the distribution and correlation plots, has_quit last
+FEATURE_COLUMNS = [
+    'age', 'experience', 'number_of_complaints',
+    'avg_inter_complaint_time', 'avg_inter_trip_time',
+    'time_since_last_trip', 'has_quit'
+]
+
 
 class SurvivalDataExplorer:
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, cache_dir: Optional[str] = './cache'):
+        """
+        Args:
+            data: Survival dataset, see build_survival_dataset
+            cache_dir: Directory caching the Kaplan-Meier fits (None disables the cache)
+        """
         self.data = data
         self.colors = px.colors.qualitative.Set3
+        self.cache_dir = cache_dir
+
+        # Contiguous float32 copy of the numerical features, reused by every plot
+        self._features = self.data[FEATURE_COLUMNS].to_numpy(dtype=np.float32, copy=True)
+
+        # Complaint frequency tercile of each driver (0 = Low, 1 = Medium, 2 = High),
+        # terciles sharing an edge are merged
+        self._complaint_codes = pd.qcut(
+            self.data['number_of_complaints'],
+            q=3,
+            labels=False,
+            duplicates='drop'
+        ).to_numpy()
 
     def plot_quit_distribution(self) -> go.Figure:
         """
@@ -42,25 +72,26 @@ class SurvivalDataExplorer:
         """
         Plot distributions of numerical features with comparison between quit and active drivers.
         """
-        numerical_cols = [
-            'age', 'experience', 'number_of_complaints',
-            'avg_inter_complaint_time', 'avg_inter_trip_time',
-            'time_since_last_trip'
-        ]
+        numerical_cols = FEATURE_COLUMNS[:-1]
 
         fig = make_subplots(
             rows=2, cols=3,
             subplot_titles=numerical_cols
         )
 
-        for idx, col in enumerate(numerical_cols, 1):
+        # Split the drivers by status once, histograms take the feature matrix columns directly
+        has_quit = self._features[:, -1]
+        active = self._features[has_quit == 0]
+        quit_ = self._features[has_quit == 1]
+
+        for idx, _ in enumerate(numerical_cols, 1):
             row = (idx - 1) // 3 + 1
             col_idx = (idx - 1) % 3 + 1
 
             # Add histogram for active drivers
             fig.add_trace(
                 go.Histogram(
-                    x=self.data[self.data['has_quit'] == 0][col],
+                    x=active[:, idx - 1],
                     name='Active',
                     opacity=0.7,
                     marker_color=self.colors[0]
@@ -71,7 +102,7 @@ class SurvivalDataExplorer:
             # Add histogram for quit drivers
             fig.add_trace(
                 go.Histogram(
-                    x=self.data[self.data['has_quit'] == 1][col],
+                    x=quit_[:, idx - 1],
                     name='Quit',
                     opacity=0.7,
                     marker_color=self.colors[1]
@@ -88,92 +119,84 @@ class SurvivalDataExplorer:
 
         return fig
 
-    def plot_kaplan_meier_curves(self) -> dict:
+    def fit_kaplan_meier_curves(self) -> Dict[str, List[Tuple[str, np.ndarray, np.ndarray]]]:
         """
-        Plot Kaplan-Meier survival curves with different stratifications.
+        Fit Kaplan-Meier survival curves with different stratifications.
+        Fits are cached in cache_dir, keyed by a fingerprint of the columns they depend on.
+        Returns (name, timeline, survival probability) of each curve, by stratification.
         """
-        kmf = KaplanMeierFitter()
-        figures = {}
-
-        # Overall survival curve
-        fig_overall = go.Figure()
-        kmf.fit(
-            self.data['experience'],
-            self.data['has_quit'],
-            label='Overall'
-        )
+        cache_file = None
+        if self.cache_dir is not None:
+            fingerprint = pd.util.hash_pandas_object(
+                self.data[['experience', 'has_quit', 'sex', 'number_of_complaints']], index=False
+            ).to_numpy()
+            key = hashlib.blake2b(fingerprint.tobytes(), digest_size=16).hexdigest()
+            cache_file = os.path.join(self.cache_dir, f'km_curves_{key}.pkl')
+            if os.path.exists(cache_file):
+                with open(cache_file, 'rb') as f:
+                    return pickle.load(f)
 
-        fig_overall.add_trace(go.Scatter(
-            x=kmf.timeline,
-            y=kmf.survival_function_.values.flatten(),
-            name='Overall',
-            line=dict(color=self.colors[0])
-        ))
+        kmf = KaplanMeierFitter()
+        experience = self.data['experience'].to_numpy()
+        has_quit = self.data['has_quit'].to_numpy()
 
-        fig_overall.update_layout(
-            title='Overall Survival Curve',
-            xaxis_title='Experience (Time)',
-            yaxis_title='Survival Probability',
-            template='plotly_white'
-        )
+        def fit(name: str, mask: Optional[np.ndarray] = None) -> Tuple[str, np.ndarray, np.ndarray]:
+            if mask is None:
+                kmf.fit(experience, has_quit, label=name)
+            else:
+                kmf.fit(experience[mask], has_quit[mask], label=name)
+            return name, kmf.timeline, kmf.survival_function_.values.flatten()
 
-        figures['overall'] = fig_overall
+        # Overall survival curve
+        curves = {'overall': [fit('Overall')]}
 
         # Survival curves by sex
-        fig_sex = go.Figure()
-        for sex in self.data['sex'].unique():
-            mask = self.data['sex'] == sex
-            kmf.fit(
-                self.data[mask]['experience'],
-                self.data[mask]['has_quit'],
-                label=f'Sex: {sex}'
-            )
+        sexes = self.data['sex'].to_numpy()
+        curves['by_sex'] = [fit(f'Sex: {sex}', sexes == sex) for sex in self.data['sex'].unique()]
 
-            fig_sex.add_trace(go.Scatter(
-                x=kmf.timeline,
-                y=kmf.survival_function_.values.flatten(),
-                name=f'Sex: {sex}'
-            ))
+        # Survival curves by complaint frequency
+        groups = ['Low', 'Medium', 'High'][:self._complaint_codes.max() + 1]
+        curves['by_complaints'] = [fit(f'Complaints: {group}', self._complaint_codes == code)
+                                   for code, group in enumerate(groups)]
 
-        fig_sex.update_layout(
-            title='Survival Curves by Sex',
-            xaxis_title='Experience (Time)',
-            yaxis_title='Survival Probability',
-            template='plotly_white'
-        )
+        if cache_file is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump(curves, f)
 
-        figures['by_sex'] = fig_sex
+        return curves
 
-        # Survival curves by complaint frequency
-        self.data['complaint_group'] = pd.qcut(
-            self.data['number_of_complaints'],
-            q=3,
-            labels=['Low', 'Medium', 'High']
-        )
+    def plot_kaplan_meier_curves(self) -> dict:
+        """
+        Plot Kaplan-Meier survival curves with different stratifications.
+        """
+        curves = self.fit_kaplan_meier_curves()
+        titles = {
+            'overall': 'Overall Survival Curve',
+            'by_sex': 'Survival Curves by Sex',
+            'by_complaints': 'Survival Curves by Complaint Frequency'
+        }
+        figures = {}
 
-        fig_complaints = go.Figure()
-        for group in self.data['complaint_group'].unique():
-            mask = self.data['complaint_group'] == group
-            kmf.fit(
-                self.data[mask]['experience'],
-                self.data[mask]['has_quit'],
-                label=f'Complaints: {group}'
+        for stratification, title in titles.items():
+            fig = go.Figure()
+            for name, timeline, survival in curves[stratification]:
+                fig.add_trace(go.Scatter(
+                    x=timeline,
+                    y=survival,
+                    name=name,
+                    # Only the overall curve has a fixed color
+                    line=dict(color=self.colors[0]) if stratification == 'overall' else None
+                ))
+
+            fig.update_layout(
+                title=title,
+                xaxis_title='Experience (Time)',
+                yaxis_title='Survival Probability',
+                template='plotly_white'
             )
 
-            fig_complaints.add_trace(go.Scatter(
-                x=kmf.timeline,
-                y=kmf.survival_function_.values.flatten(),
-                name=f'Complaints: {group}'
-            ))
-
-        fig_complaints.update_layout(
-            title='Survival Curves by Complaint Frequency',
-            xaxis_title='Experience (Time)',
-            yaxis_title='Survival Probability',
-            template='plotly_white'
-        )
-
-        figures['by_complaints'] = fig_complaints
+            figures[stratification] = fig
 
         return figures
 
@@ -181,18 +204,12 @@ class SurvivalDataExplorer:
         """
         Plot correlation matrix of numerical features.
         """
-        numerical_cols = [
-            'age', 'experience', 'number_of_complaints',
-            'avg_inter_complaint_time', 'avg_inter_trip_time',
-            'time_since_last_trip', 'has_quit'
-        ]
-
-        corr_matrix = self.data[numerical_cols].corr()
+        corr_matrix = np.corrcoef(self._features, rowvar=False)
 
         fig = go.Figure(data=go.Heatmap(
-            z=corr_matrix.values,
-            x=corr_matrix.columns,
-            y=corr_matrix.columns,
+            z=corr_matrix,
+            x=FEATURE_COLUMNS,
+            y=FEATURE_COLUMNS,
             colorscale='RdBu',
             zmin=-1,
             zmax=1
@@ -209,7 +226,6 @@ class SurvivalDataExplorer:
         """
         Create and save all visualizations as HTML files.
         """
-        import os
         os.makedirs(output_dir, exist_ok=True)
 
         # Generate all plots
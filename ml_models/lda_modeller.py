@@ -1,7 +1,13 @@
 import os
 import re
+import pickle
+import hashlib
+import functools
+import tempfile
+import numpy as np
 import pandas as pd
-from typing import List, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Dict
 
 import gensim
 from gensim import corpora, models
@@ -9,29 +15,39 @@ from gensim.models import CoherenceModel
 
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 
 # Download required NLTK data
-nltk.download('punkt_tab')
 nltk.download('stopwords')
 nltk.download('wordnet')
 
+# Comments handed to each worker process at a time
+WORKER_CHUNKSIZE = 256
+
 
 class CSVComplaintAnalyzer:
     def __init__(self, num_topics: int = 2):
         self.num_topics = num_topics
         self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
 
-        # Add domain-specific stop words
-        self.stop_words.update(['driver', 'truck', 'trailer', 'delivery'])
+        # English and domain-specific stop words
+        self.stop_words = frozenset(stopwords.words('english')) | {'driver', 'truck', 'trailer', 'delivery'}
+
+        # Special characters and digits are removed, then runs of 3 or more letters are the tokens
+        self._strip_re = re.compile(r'[^a-zA-Z\s]')
+        self._token_re = re.compile(r'[a-z]{3,}')
+        # Comments share most of their vocabulary, so lemmas are memoized
+        self._lemmatize = functools.lru_cache(maxsize=200_000)(self.lemmatizer.lemmatize)
+        # Duplicate comments are common too, and prediction preprocesses comments again
+        self._cached_tokens = functools.lru_cache(maxsize=100_000)(self._tokenize)
 
         # Initialize model attributes
         self.dictionary = None
         self.lda_model = None
         self.corpus = None
         self.data_df = None
+        # Holds the corpus file while the cache is disabled
+        self._corpus_dir = None
 
     def preprocess_text(self, text: str) -> List[str]:
         """
@@ -41,20 +57,18 @@ class CSVComplaintAnalyzer:
         if not isinstance(text, str):
             return []
 
-        # Convert to lowercase
-        text = text.lower()
-
-        # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        # Cached tokens are immutable, callers get their own list
+        return list(self._cached_tokens(text))
 
-        # Tokenization
-        tokens = word_tokenize(text)
+    def _tokenize(self, text: str) -> Tuple[str, ...]:
+        """
+        Tokens of a comment, see preprocess_text.
+        """
+        # Lowercase, remove special characters and digits, then tokenize
+        tokens = self._token_re.findall(self._strip_re.sub('', text.lower()))
 
         # Remove stopwords and lemmatize
-        tokens = [self.lemmatizer.lemmatize(token) for token in tokens
-                  if token not in self.stop_words and len(token) > 2]
-
-        return tokens
+        return tuple(self._lemmatize(token) for token in tokens if token not in self.stop_words)
 
     def load_data(self, complaints_file: str) -> pd.DataFrame:
         """
@@ -73,36 +87,69 @@ class CSVComplaintAnalyzer:
         except Exception as e:
             raise Exception(f"Error loading CSV file: {str(e)}")
 
-    def train_model(self, complaints_file: str) -> Tuple[float, Dict, pd.DataFrame]:
+    def train_model(self, complaints_file: str, workers: Optional[int] = None,
+                    cache_dir: Optional[str] = './cache') -> Tuple[float, Dict, pd.DataFrame]:
         """
         Train the LDA topic model using data from CSV.
+        Preprocessing, training and topic inference run in worker processes (workers=1 runs
+        preprocessing and inference in-process and trains with a single worker).
+        Processed comments, the dictionary and the bag-of-words corpus are cached in cache_dir,
+        keyed by the file contents (None disables the cache). The corpus is streamed to a
+        Matrix Market file and read back lazily by training and inference.
         Returns coherence score, topic keywords, and enriched DataFrame.
         """
         # Load and prepare data
         self.load_data(complaints_file)
 
-        # Preprocess comments
-        processed_docs = [self.preprocess_text(comment) for comment in self.data_df['comment']]
-
-        # Create dictionary
-        self.dictionary = corpora.Dictionary(processed_docs)
-
-        # Filter out extreme frequencies
-        self.dictionary.filter_extremes(no_below=2, no_above=0.9)
-
-        # Create corpus
-        self.corpus = [self.dictionary.doc2bow(doc) for doc in processed_docs]
-
-        # Train LDA model
-        self.lda_model = models.LdaModel(
+        cache_file = None
+        if cache_dir is not None:
+            digest = hashlib.sha1()
+            with open(complaints_file, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            key = digest.hexdigest()[:16]
+            cache_file = os.path.join(cache_dir, f'lda_docs_{key}.pkl')
+            corpus_file = os.path.join(cache_dir, f'lda_corpus_{key}.mm')
+        else:
+            self._corpus_dir = tempfile.TemporaryDirectory()
+            corpus_file = os.path.join(self._corpus_dir.name, 'lda_corpus.mm')
+
+        if cache_file is not None and os.path.exists(cache_file):
+            with open(cache_file, 'rb') as f:
+                processed_docs, self.dictionary = pickle.load(f)
+        else:
+            # Preprocess comments
+            processed_docs = self._preprocess_comments(self.data_df['comment'].tolist(), workers)
+
+            # Create dictionary
+            self.dictionary = corpora.Dictionary(processed_docs)
+
+            # Filter out extreme frequencies
+            self.dictionary.filter_extremes(no_below=2, no_above=0.9)
+
+            if cache_file is not None:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(cache_file, 'wb') as f:
+                    pickle.dump((processed_docs, self.dictionary), f)
+
+        # Create corpus, bags of words are written as they are built instead of held in a list
+        if not os.path.exists(corpus_file):
+            os.makedirs(os.path.dirname(corpus_file), exist_ok=True)
+            corpora.MmCorpus.serialize(corpus_file, (self.dictionary.doc2bow(doc) for doc in processed_docs))
+        self.corpus = corpora.MmCorpus(corpus_file)
+
+        # Train LDA model, the E-step runs in worker processes while this one runs the M-step
+        # LdaMulticore cannot learn alpha, so a symmetric prior replaces alpha='auto'
+        self.lda_model = models.LdaMulticore(
             corpus=self.corpus,
             id2word=self.dictionary,
             num_topics=self.num_topics,
+            workers=max(1, (workers or os.cpu_count()) - 1),
             random_state=42,
-            update_every=1,
-            chunksize=100,
+            chunksize=2000,
             passes=10,
-            alpha='auto',
+            alpha='symmetric',
+            eval_every=None,
             per_word_topics=True
         )
 
@@ -120,22 +167,49 @@ class CSVComplaintAnalyzer:
         for idx, topic in self.lda_model.show_topics(formatted=False):
             topic_keywords[idx] = [(w, round(p, 4)) for w, p in topic]
 
-        # Add predicted topics to DataFrame
-        topic_predictions = self.predict_topics(self.data_df['comment'].tolist())
-        self.data_df['predicted_topic'] = topic_predictions
+        # Topic distributions of the already processed corpus
+        topic_distributions = self._infer_topic_distributions(self.corpus, workers)
 
-        # Add topic distributions
-        topic_distributions = [self.get_topic_distribution(comment)
-                               for comment in self.data_df['comment']]
+        # Add predicted topics to DataFrame
+        self.data_df['predicted_topic'] = [self._dominant_topic(dist) for dist in topic_distributions]
 
-        # Add probability for each topic
-        for topic_idx in range(self.num_topics):
-            self.data_df[f'topic_{topic_idx}_prob'] = [
-                dict(dist).get(topic_idx, 0.0) for dist in topic_distributions
-            ]
+        # Add probability for each topic, gensim omits topics below its minimum probability
+        topic_probs = np.zeros((len(topic_distributions), self.num_topics), dtype=np.float32)
+        for row, dist in enumerate(topic_distributions):
+            for topic_idx, prob in dist:
+                topic_probs[row, topic_idx] = prob
+        self.data_df[[f'topic_{topic_idx}_prob' for topic_idx in range(self.num_topics)]] = topic_probs
 
         return coherence_score, topic_keywords, self.data_df
 
+    def _preprocess_comments(self, comments: List[str], workers: Optional[int]) -> List[List[str]]:
+        """
+        Preprocess comments, in a process pool unless workers is 1.
+        """
+        if workers == 1:
+            return [self.preprocess_text(comment) for comment in comments]
+
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_preprocess_worker,
+                                 initargs=(self.num_topics,)) as executor:
+            return list(executor.map(_preprocess_comment, comments, chunksize=WORKER_CHUNKSIZE))
+
+    def _infer_topic_distributions(self, corpus: List[List[Tuple[int, int]]],
+                                   workers: Optional[int]) -> List[List[Tuple[int, float]]]:
+        """
+        Topic distribution of each bag of words, in a process pool unless workers is 1.
+        Workers load the trained model from a temporary directory.
+        """
+        if workers == 1:
+            return [self.lda_model.get_document_topics(bow) for bow in corpus]
+
+        with tempfile.TemporaryDirectory() as model_dir:
+            self.lda_model.save(os.path.join(model_dir, 'lda_model'))
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_inference_worker,
+                                     initargs=(model_dir,)) as executor:
+                return list(executor.map(_infer_topics, corpus, chunksize=WORKER_CHUNKSIZE))
+
     def predict_topics(self, comments: List[str]) -> List[int]:
         """
         Predict dominant topic for each comment.
@@ -153,11 +227,17 @@ class CSVComplaintAnalyzer:
             topic_dist = self.lda_model.get_document_topics(bow)
 
             # Get dominant topic
-            dominant_topic = max(topic_dist, key=lambda x: x[1])[0] if topic_dist else 0
-            predictions.append(dominant_topic)
+            predictions.append(self._dominant_topic(topic_dist))
 
         return predictions
 
+    @staticmethod
+    def _dominant_topic(topic_dist: List[Tuple[int, float]]) -> int:
+        """
+        Topic with the highest probability, 0 for an empty distribution.
+        """
+        return max(topic_dist, key=lambda x: x[1])[0] if topic_dist else 0
+
     def get_topic_distribution(self, comment: str) -> List[Tuple[int, float]]:
         """
         Get complete topic distribution for a single comment.
@@ -203,3 +283,23 @@ class CSVComplaintAnalyzer:
 
         self.lda_model = models.LdaModel.load(model_path)
         self.dictionary = corpora.Dictionary.load(dict_path)
+
+
+# Analyzer and model of each worker process, set by the pool initializers
+_worker_state = {}
+
+
+def _init_preprocess_worker(num_topics: int):
+    _worker_state['analyzer'] = CSVComplaintAnalyzer(num_topics=num_topics)
+
+
+def _preprocess_comment(comment: str) -> List[str]:
+    return _worker_state['analyzer'].preprocess_text(comment)
+
+
+def _init_inference_worker(model_dir: str):
+    _worker_state['lda_model'] = models.LdaModel.load(os.path.join(model_dir, 'lda_model'))
+
+
+def _infer_topics(bow: List[Tuple[int, int]]) -> List[Tuple[int, float]]:
+    return _worker_state['lda_model'].get_document_topics(bow)
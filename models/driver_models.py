@@ -1,7 +1,9 @@
+import numpy as np
 from datetime import datetime
 from dataclasses import dataclass
+from typing import Dict, Sequence
 
-@dataclass
+@dataclass(slots=True)
 class Trip:
     route_id: int
     start_datetime: datetime
@@ -15,8 +17,45 @@ class Trip:
     has_complain: bool = False
     driver_quit: bool = False
 
-@dataclass
+    def __setstate__(self, state):
+        """Restore slot values, including pickles saved before Trip used slots (plain dict state)."""
+        if isinstance(state, tuple):
+            instance_dict, slot_state = state
+            state = {**(instance_dict or {}), **slot_state}
+        for name, value in state.items():
+            setattr(self, name, value)
+
+@dataclass(slots=True)
 class DriverProfile:
     id: int
     age: int
     years_experience: int
+
+
+# dtype of each numeric Trip field in the columnar (structure of arrays) view
+TRIP_SOA_DTYPES = {
+    'route_id': np.int32,
+    'on_time': np.bool_,
+    'min_completion_time': np.float32,
+    'assaulted': np.bool_,
+    'trouble_score': np.float32,
+    'stress_score': np.float32,
+    'has_complain': np.bool_,
+    'driver_quit': np.bool_
+}
+
+
+def trips_to_soa(trips: Sequence[Trip]) -> Dict[str, np.ndarray]:
+    """
+    Build a columnar view of trips for numeric code
+
+    Args:
+        trips: Trips to convert
+
+    Returns:
+        Dict with one array per field in TRIP_SOA_DTYPES, in trip order
+    """
+    return {
+        field: np.fromiter((getattr(trip, field) for trip in trips), dtype=dtype, count=len(trips))
+        for field, dtype in TRIP_SOA_DTYPES.items()
+    }
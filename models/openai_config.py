@@ -1,17 +1,37 @@
 from dotenv import dotenv_values
 from dataclasses import dataclass
-from pydantic import BaseModel
-from typing_extensions import TypeVar
+from functools import lru_cache
+from typing import Optional
 
-config = dotenv_values("openai.env")
 
-T = TypeVar('T', bound=BaseModel)
+@lru_cache(maxsize=1)
+def _load_env() -> dict:
+    """Parse openai.env once per process."""
+    return dotenv_values("openai.env")
+
 
 @dataclass(frozen=True)
 class OpenAIConfig:
-    api_key = config.get('LLM_API_KEY')
-    organization = config.get('LLM_ORGANIZATION')
-    project = config.get('LLM_PROJECT')
-    model = config.get('LLM_MODEL')
-    temperature = config.get('LLM_TEMPERATURE', 0.7)
-    max_tokens = config.get('LLM_MAX_TOKENS', 2048)
\ No newline at end of file
+    api_key: Optional[str] = None
+    organization: Optional[str] = None
+    project: Optional[str] = None
+    model: Optional[str] = None
+    temperature: float = 0.7
+    max_tokens: int = 2048
+    # Output limit of the model for a single completion
+    max_output_tokens: int = 16384
+
+    @classmethod
+    @lru_cache(maxsize=1)
+    def from_env(cls) -> 'OpenAIConfig':
+        """Build the configuration from openai.env, converting the numeric settings once."""
+        config = _load_env()
+        return cls(
+            api_key=config.get('LLM_API_KEY'),
+            organization=config.get('LLM_ORGANIZATION'),
+            project=config.get('LLM_PROJECT'),
+            model=config.get('LLM_MODEL'),
+            temperature=float(config.get('LLM_TEMPERATURE', cls.temperature)),
+            max_tokens=int(config.get('LLM_MAX_TOKENS', cls.max_tokens)),
+            max_output_tokens=int(config.get('LLM_MAX_OUTPUT_TOKENS', cls.max_output_tokens))
+        )
@@ -1,10 +1,22 @@
-from typing import List
+import numpy as np
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class RouteInfo:
     start: int
     end: int
-    path: List[int]
+    # int32 node ids
+    path: np.ndarray
     total_distance: float
-    total_price: float
\ No newline at end of file
+    total_price: float
+
+    def _key(self) -> tuple:
+        return self.start, self.end, self.path.tobytes(), self.total_distance, self.total_price
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
@@ -1,21 +1,53 @@
-import ast
-from typing import Type
-from openai import OpenAI, RateLimitError
-from models.openai_config import OpenAIConfig, T
-from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
+import re
+import asyncio
+import threading
+from typing import TYPE_CHECKING, List, Optional
+from logger.logger import logger
+from models.openai_config import OpenAIConfig
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception
+
+# The openai SDK is imported on first use, so importing the handler (e.g. through driver_life) stays cheap
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+def _is_rate_limit(exception: BaseException) -> bool:
+    """Whether a failed request was rate limited, openai is already loaded once a request has been made."""
+    from openai import RateLimitError
+    return isinstance(exception, RateLimitError)
+
+
+# Rate limited requests back off exponentially with jitter, so concurrent requests do not retry in lockstep
+retry_on_rate_limit = retry(stop=stop_after_attempt(6),
+                            wait=wait_random_exponential(min=1, max=60),
+                            retry=retry_if_exception(_is_rate_limit))
+
+# Sent ahead of the labeled queries of a batched request
+BATCH_INSTRUCTIONS = ("Answer each of the following {number_prompts} queries separately. Start every answer "
+                      "on a new line with the label of its query, e.g. [0], and do not repeat the queries.\n\n")
+
+# Labeled answer of a batched response, running until the next label or the end of the text
+_ANSWER_RE = re.compile(r"\[(\d+)\]\s*(.*?)(?=\n\[\d+\]|\Z)", re.S)
 
 
 class OpenAIHandler:
     def __init__(self):
-        config = OpenAIConfig
+        config = OpenAIConfig.from_env()
         self.api_key = config.api_key
         self.organization = config.organization
         self.project = config.project
         self.model = config.model
-        self.temperature = float(config.temperature)
-        self.max_tokens = int(config.max_tokens)
+        self.temperature = config.temperature
+        self.max_tokens = config.max_tokens
+        self.max_output_tokens = config.max_output_tokens
 
         # Initialize token counts
+        # Requests may finish on several threads (and interleave on the event loop)
+        self._tokens_lock = threading.Lock()
+        # Cost is recomputed only after the token counts or the prices change
+        self._cost_dirty = True
+        self._cached_cost = 0.0
+
         self.tokens_unit=1000000
         self.total_input_tokens = 0
         self.total_output_tokens = 0
@@ -23,34 +55,78 @@ class OpenAIHandler:
         self.output_token_cost = 0.3
         self.total_prompts = 0
 
-        self.client = self._create_client()
+        # Single asyncio client shared by every request, see _get_client
+        self.client = None
+        self._client_loop = None
+
+
+    @property
+    def tokens_unit(self):
+        return self._tokens_unit
+
+    @tokens_unit.setter
+    def tokens_unit(self, tokens_unit):
+        with self._tokens_lock:
+            self._tokens_unit = tokens_unit
+            self._cost_dirty = True
+
+    @property
+    def input_token_cost(self):
+        return self._input_token_cost
+
+    @input_token_cost.setter
+    def input_token_cost(self, input_token_cost):
+        with self._tokens_lock:
+            self._input_token_cost = input_token_cost
+            self._cost_dirty = True
 
+    @property
+    def output_token_cost(self):
+        return self._output_token_cost
 
-    def _create_client(self):
-        """Sets up the OpenAI API key and base URL globally."""
-        return OpenAI(
+    @output_token_cost.setter
+    def output_token_cost(self, output_token_cost):
+        with self._tokens_lock:
+            self._output_token_cost = output_token_cost
+            self._cost_dirty = True
+
+    def _create_client(self) -> "AsyncOpenAI":
+        """Sets up the asyncio OpenAI client with the handler credentials."""
+        from openai import AsyncOpenAI
+        return AsyncOpenAI(
             api_key=self.api_key,
             organization=self.organization,
             project=self.project
         )
 
-    @retry(stop=stop_after_attempt(10), wait=wait_fixed(360), retry=retry_if_exception_type(RateLimitError))
-    def chat_complete_with_model(self,
-                                 system_role: str,
-                                 system_content: str,
-                                 prompt: str,
-                                 stop=None) -> str:
+    def _get_client(self) -> "AsyncOpenAI":
+        """
+        Return the shared client, created on first use.
+        Its connection pool belongs to one event loop, so a new loop (e.g. another asyncio.run) gets a new client.
+        """
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
+            self.client = self._create_client()
+            self._client_loop = loop
+        return self.client
+
+    @retry_on_rate_limit
+    async def chat_complete_with_model(self,
+                                       system_role: str,
+                                       system_content: str,
+                                       prompt: str,
+                                       stop=None) -> str:
         """
-        Method to run a chat completion and return the result as a Pydantic model.
+        Method to run a chat completion, several calls can be awaited concurrently with asyncio.gather.
         :param system_role: Role description of the AI assistant.
+        :param system_content: System message sent with the prompt.
         :param prompt: The prompt string to send to the API.
-        :param model_class: The Pydantic model class to deserialize the response into.
-        :param max_tokens: Maximum number of tokens for the response.
         :param stop: Sequence where the API will stop generating further tokens.
-        :return: The deserialized response as an instance of the provided Pydantic model class.
+        :return: The completion content.
         """
+        # Errors keep their type, so only rate limits are retried and anything else fails at once
         try:
-            response = self.client.chat.completions.create(
+            response = await self._get_client().chat.completions.create(
                 messages=[
                     {"role": system_role, "content": system_content},
                     {"role": "user", "content": prompt}
@@ -60,19 +136,115 @@ class OpenAIHandler:
                 max_tokens=self.max_tokens,
                 stop=stop
             )
+        except Exception as e:
+            logger.error(f"Chat completion error: {str(e)}")
+            raise
+
+        # Extract and return the content and the token usage info
 
-            # Extract and return the content and the token usage info
+        raw_content = response.choices[0].message.content
+        input_tokens, output_tokens = self._count_tokens(response)
 
-            raw_content = response.choices[0].message.content
-            input_tokens, output_tokens = self._count_tokens(response)
+        # Update the general token count
+        self._update_total_tokens(input_tokens, output_tokens)
+        return raw_content
 
-            # Update the general token count
-            self._update_total_tokens(input_tokens, output_tokens)
-            self.total_prompts+=1
-            return raw_content
+    async def chat_complete_batch(self,
+                                  system_role: str,
+                                  system_content: str,
+                                  prompts: List[str],
+                                  batch_size: int = 8,
+                                  stop=None) -> List[Optional[str]]:
+        """
+        Method to answer several prompts with one request per batch, so the system message is sent once per batch.
+        The batches are requested concurrently.
+        :param system_role: Role description of the AI assistant.
+        :param system_content: System message sent with every batch.
+        :param prompts: The prompt strings to send to the API.
+        :param batch_size: Number of prompts answered by each request.
+        :param stop: Sequence where the API will stop generating further tokens.
+        :return: The answers, in the same order as the prompts, None where the model skipped a label.
+        """
+        batches = await asyncio.gather(*(
+            self._chat_complete_batch(system_role, system_content, prompts[begin:begin + batch_size], stop)
+            for begin in range(0, len(prompts), batch_size)
+        ))
+        return [answer for batch in batches for answer in batch]
+
+    @retry_on_rate_limit
+    async def _chat_complete_batch(self,
+                                   system_role: str,
+                                   system_content: str,
+                                   prompts: List[str],
+                                   stop=None) -> List[Optional[str]]:
+        """
+        Method to answer a batch of prompts labeled [0], [1], ... in a single chat completion.
+        :param system_role: Role description of the AI assistant.
+        :param system_content: System message sent with the batch.
+        :param prompts: The prompt strings of the batch.
+        :param stop: Sequence where the API will stop generating further tokens.
+        :return: The answers, in the same order as the prompts, None where the model skipped a label.
+        """
+        batch_prompt = BATCH_INSTRUCTIONS.format(number_prompts=len(prompts)) + "\n".join(
+            f"[{index}] {prompt}" for index, prompt in enumerate(prompts))
+        try:
+            response = await self._get_client().chat.completions.create(
+                messages=[
+                    {"role": system_role, "content": system_content},
+                    {"role": "user", "content": batch_prompt}
+                ],
+                model=self.model,
+                temperature=self.temperature,
+                # Room for an answer of the usual length per prompt, within the model's output limit
+                max_tokens=min(self.max_tokens * len(prompts), self.max_output_tokens),
+                stop=stop
+            )
         except Exception as e:
-            print(f"Error while running text completion: {e}")
-            raise RateLimitError
+            logger.error(f"Batch chat completion error: {str(e)}")
+            raise
+
+        input_tokens, output_tokens = self._count_tokens(response)
+        self._update_total_tokens(input_tokens, output_tokens, number_prompts=len(prompts))
+
+        return self._parse_batch(response.choices[0].message.content or '', len(prompts))
+
+    @staticmethod
+    def _parse_batch(text: str, number_prompts: int) -> List[Optional[str]]:
+        """
+        Method to split a batched response into the answers of its labeled queries.
+        :param text: Content of the batched response.
+        :param number_prompts: Number of prompts of the batch.
+        :return: The answers by label, None where the model skipped a label.
+        """
+        answers = [None] * number_prompts
+        for match in _ANSWER_RE.finditer(text):
+            index = int(match.group(1))
+            if index < number_prompts:
+                answers[index] = match.group(2).strip()
+        return answers
+
+    async def chat_complete_many_async(self,
+                                       system_role: str,
+                                       system_content: str,
+                                       prompts: List[str],
+                                       max_concurrency: int = 10,
+                                       stop=None) -> List[str]:
+        """
+        Method to run several chat completions concurrently, overlapping their network latency.
+        :param system_role: Role description of the AI assistant.
+        :param system_content: System message sent with every prompt.
+        :param prompts: The prompt strings to send to the API.
+        :param max_concurrency: Maximum number of requests in flight at the same time.
+        :param stop: Sequence where the API will stop generating further tokens.
+        :return: The completion contents, in the same order as the prompts.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def complete(prompt: str) -> str:
+            async with semaphore:
+                return await self.chat_complete_with_model(system_role, system_content, prompt, stop)
+
+        return list(await asyncio.gather(*(complete(prompt) for prompt in prompts)))
 
     @staticmethod
     def _count_tokens(response):
@@ -87,20 +259,25 @@ class OpenAIHandler:
         output_tokens = response.usage.completion_tokens
         return input_tokens, output_tokens
 
-    def _update_total_tokens(self, input_tokens, output_tokens):
+    def _update_total_tokens(self, input_tokens, output_tokens, number_prompts=1):
         """
-        Update the total input and output tokens of the class.
+        Update the total input and output tokens and the prompt count of the class, atomically.
 
         :param input_tokens: The number of input tokens for this request.
         :param output_tokens: The number of output tokens for this request.
+        :param number_prompts: The number of prompts answered by this request.
         """
-        self.total_input_tokens += input_tokens
-        self.total_output_tokens += output_tokens
+        with self._tokens_lock:
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.total_prompts += number_prompts
+            self._cost_dirty = True
 
     def set_api_key(self, api_key):
         """Set a new API key if needed."""
         self.api_key = api_key
-        self._create_client()
+        # The next request creates a client with the new key
+        self.client = None
 
     def set_model(self, model):
         """Set a new model to be used in OpenAI API requests."""
@@ -115,14 +292,16 @@ class OpenAIHandler:
         Calculate the total cost based on token usage.
         :return: Total cost of all the tokens used.
         """
-        unit = self.tokens_unit
-        input_cost = (self.total_input_tokens / unit) * self.input_token_cost
-        output_cost = (self.total_output_tokens / unit) * self.output_token_cost
-        return input_cost + output_cost
+        with self._tokens_lock:
+            if self._cost_dirty:
+                self._cached_cost = ((self.total_input_tokens / self._tokens_unit) * self._input_token_cost +
+                                     (self.total_output_tokens / self._tokens_unit) * self._output_token_cost)
+                self._cost_dirty = False
+            return self._cached_cost
 
 
     def handler_information(self):
         print(f'Total prompts used: {self.total_prompts}')
-        print(f'Total input tokens: {self.total_input_tokens} at a cost of {str(self.input_token_cost)} per {str(self.tokens_unit)} tokens')
-        print(f'Total output tokens: {self.total_output_tokens} at a cost of {str(self.output_token_cost)} per {str(self.tokens_unit)} tokens')
+        print(f'Total input tokens: {self.total_input_tokens} at a cost of {self.input_token_cost} per {self.tokens_unit} tokens')
+        print(f'Total output tokens: {self.total_output_tokens} at a cost of {self.output_token_cost} per {self.tokens_unit} tokens')
         print(f'Total cost of evaluation{self.handler_cost()}')
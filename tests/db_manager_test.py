@@ -1,15 +1,48 @@
 import pytest
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 from db.db_manager import MySQLManager
-from models.db_models import Base, Node, TrailerDriver
+from models.db_models import Base, Node, TrailerDriver, UnloadingDifficult
 
 
-@pytest.fixture
-def db_manager():
-    """Create a test database manager using SQLite for testing"""
-    manager = MySQLManager("sqlite:///:memory:")
+@pytest.fixture(scope="session")
+def db_engine():
+    """Create the SQLite test database and its schema once per test session"""
+    manager = MySQLManager("sqlite:///file::memory:?cache=shared&uri=true")
     manager.init_db(Base)
-    return manager
+
+    engine = manager.get_engine()
+
+    # pysqlite defers BEGIN to the first DML statement and then commits on RELEASE SAVEPOINT,
+    # emit BEGIN ourselves so the per-test transaction really wraps the savepoints
+    def _begin(connection):
+        connection.connection.driver_connection.isolation_level = None
+        connection.exec_driver_sql("BEGIN")
+
+    event.listen(engine, "begin", _begin)
+    yield manager
+    event.remove(engine, "begin", _begin)
+    manager.close()
+
+
+@pytest.fixture
+def db_manager(db_engine):
+    """
+    Test database manager whose sessions join an external transaction
+
+    Sessions commit to savepoints of a transaction that is rolled back after
+    each test, so every test starts from empty tables without running DDL again.
+    """
+    engine = db_engine.get_engine()
+    connection = engine.connect()
+    transaction = connection.begin()
+    db_engine.bind_sessions(connection, join_transaction_mode="create_savepoint")
+
+    yield db_engine
+
+    transaction.rollback()
+    connection.close()
+    db_engine.bind_sessions(engine)
 
 
 @pytest.fixture
@@ -45,11 +78,26 @@ def test_session_scope(db_manager):
 
 def test_session_rollback(db_manager):
     """Test session rollback on error"""
-    try:
+    with pytest.raises(Exception, match="Test rollback"):
         with db_manager.session_scope() as session:
             node = Node(node_id=1, name="Test Node")
             session.add(node)
             raise Exception("Test rollback")
-    finally:
-        with db_manager.session_scope() as session:
-            assert session.query(Node).count() == 0
\ No newline at end of file
+
+    with db_manager.session_scope() as session:
+        assert session.query(Node).count() == 0
+
+def test_get_all(db_manager):
+    """Test reading all rows of a table as dicts"""
+    with db_manager.session_scope() as session:
+        session.add_all([
+            Node(node_id=1, name="First Node", node_difficult=UnloadingDifficult.EASY),
+            Node(node_id=2, name="Second Node", node_difficult=UnloadingDifficult.HARD)
+        ])
+
+    nodes = db_manager.get_all(Node)
+    assert nodes == [
+        {'node_id': 1, 'name': "First Node", 'node_difficult': UnloadingDifficult.EASY},
+        {'node_id': 2, 'name': "Second Node", 'node_difficult': UnloadingDifficult.HARD}
+    ]
+    assert list(db_manager.iter_all(Node, batch_size=1)) == nodes
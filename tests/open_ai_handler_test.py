@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from open_ai.open_ai_handler import OpenAIHandler
+
+
+class FakeCompletions:
+    """Stand-in for client.chat.completions answering every request with the next canned reply"""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    async def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.replies.pop(0)))],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+        )
+
+
+@pytest.fixture
+def handler():
+    """Handler with the default prices and no API calls made"""
+    return OpenAIHandler()
+
+
+def answer_batch(handler, replies, prompts, batch_size=8):
+    """Run chat_complete_batch against canned replies, returns the answers and the sent requests"""
+    completions = FakeCompletions(replies)
+    handler._get_client = lambda: SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    answers = asyncio.run(handler.chat_complete_batch("system", "Be brief.", prompts, batch_size=batch_size))
+    return answers, completions.requests
+
+
+def test_handler_cost_follows_price_changes(handler):
+    """Test that the cost is recomputed after the prices change"""
+    handler._update_total_tokens(2000000, 1000000)
+    assert handler.handler_cost() == pytest.approx(2 * 0.15 + 0.3)
+
+    handler.input_token_cost = 1.0
+    assert handler.handler_cost() == pytest.approx(2 * 1.0 + 0.3)
+
+    handler.tokens_unit = 500000
+    assert handler.handler_cost() == pytest.approx(4 * 1.0 + 2 * 0.3)
+
+
+def test_batch_answers_by_label(handler):
+    """Test that answers are matched to their labels, not to their position"""
+    answers, requests = answer_batch(handler, ["[1] second\n[0] first\nover two lines"], ["a", "b"])
+    assert answers == ["first\nover two lines", "second"]
+    assert len(requests) == 1
+    assert requests[0]["messages"][1]["content"].endswith("[0] a\n[1] b")
+    assert handler.total_prompts == 2
+
+
+def test_batch_skips_preamble(handler):
+    """Test that text before the first label is not part of any answer"""
+    answers, _ = answer_batch(handler, ["Here are the answers:\n[0] first\n[1] second"], ["a", "b"])
+    assert answers == ["first", "second"]
+
+
+def test_batch_missing_and_out_of_range_labels(handler):
+    """Test that skipped labels give None and labels beyond the batch are dropped"""
+    answers, _ = answer_batch(handler, ["[0] first\n[5] extra\n[2] third"], ["a", "b", "c"])
+    assert answers == ["first", None, "third"]
+
+
+def test_batch_duplicate_label_keeps_last(handler):
+    """Test that a repeated label resolves to its last answer"""
+    answers, _ = answer_batch(handler, ["[0] draft\n[0] final\n[1] second"], ["a", "b"])
+    assert answers == ["final", "second"]
+
+
+def test_batch_inline_label_stays_in_answer(handler):
+    """Test that a label not starting a line is part of the previous answer"""
+    answers, _ = answer_batch(handler, ["[0] see [1] below\n[1] second"], ["a", "b"])
+    assert answers == ["see [1] below", "second"]
+
+
+def test_batch_splits_prompts_and_caps_max_tokens(handler):
+    """Test that prompts are sent in batches and max_tokens stays within the model output limit"""
+    handler.max_tokens = 6000
+    handler.max_output_tokens = 10000
+    answers, requests = answer_batch(handler, ["[0] a\n[1] b", "[0] c"], ["p0", "p1", "p2"], batch_size=2)
+    assert answers == ["a", "b", "c"]
+    assert [request["max_tokens"] for request in requests] == [10000, 6000]
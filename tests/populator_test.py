@@ -0,0 +1,69 @@
+import asyncio
+import pytest
+from db.db_manager import MySQLManager
+from db.population_node import NodePopulator
+from db.population_topic import TopicPopulator
+from models.db_models import Base, Node, Topic, UnloadingDifficult
+
+
+@pytest.fixture
+def db_manager():
+    """Create a test database manager using SQLite for testing"""
+    manager = MySQLManager("sqlite:///:memory:")
+    manager.init_db(Base)
+    return manager
+
+
+@pytest.fixture
+def node_populator(db_manager):
+    """Node populator bound to the test database"""
+    return NodePopulator(db_manager=db_manager, table=Node, seed=42)
+
+
+def test_populate_generated_records(db_manager, node_populator):
+    """Test bulk insertion of generated records"""
+    node_populator.populate(number_records=10)
+    nodes = db_manager.get_all(Node)
+    assert len(nodes) == 10
+    assert [node['node_id'] for node in nodes] == list(range(1, 11))
+
+
+def test_populate_in_batches(db_manager, node_populator):
+    """Test that records spanning several batches are all inserted"""
+    records = (
+        dict(name=f"City {i}", node_difficult=UnloadingDifficult.EASY)
+        for i in range(25)
+    )
+    node_populator.populate(list_records=records, batch_size=7)
+    assert len(db_manager.get_all(Node)) == 25
+
+
+def test_populate_incompatible_records(node_populator):
+    """Test that rows with unknown columns are rejected"""
+    with pytest.raises(TypeError, match="not compatible"):
+        node_populator.populate(list_records=[{'unknown_column': 1}])
+
+
+def test_populate_empty_records(node_populator):
+    """Test that an empty record list is rejected"""
+    with pytest.raises(ValueError, match="list is empty"):
+        node_populator.populate(list_records=[])
+
+
+def test_populate_async_concurrent_tables(tmp_path):
+    """Test that FK-independent tables can be populated concurrently"""
+    manager = MySQLManager(f"sqlite:///{tmp_path / 'test.db'}")
+    manager.init_db(Base)
+    node_populator = NodePopulator(db_manager=manager, table=Node, seed=42)
+    topic_populator = TopicPopulator(db_manager=manager, table=Topic)
+
+    async def populate():
+        await asyncio.gather(
+            node_populator.populate_async(number_records=10, batch_size=3),
+            topic_populator.populate_async(list_records=topic_populator.create_record_list())
+        )
+        await manager.close_async()
+
+    asyncio.run(populate())
+    assert len(manager.get_all(Node)) == 10
+    assert len(manager.get_all(Topic)) == 3
@@ -1,12 +1,30 @@
 import pytest
+import pickle
 import networkx as nx
+from functools import lru_cache
 from graph_city.synthetic_graph import SyntheticGraph, RouteInfo
 
 
+@lru_cache(maxsize=None)
+def _make_graph(num_nodes: int, random_seed: int) -> SyntheticGraph:
+    """Build each graph once per test session, tests only read from it."""
+    return SyntheticGraph(num_nodes=num_nodes, random_seed=random_seed)
+
+
 @pytest.fixture
 def graph():
     """Fixture to create a test graph instance."""
-    return SyntheticGraph(num_nodes=5, random_seed=42)
+    return _make_graph(5, 42)
+
+
+@pytest.fixture(scope="session")
+def graph_matrices():
+    """Fixture with a test graph and its distance and price matrices indexed by node id."""
+    graph = _make_graph(5, 42)
+    nodes = range(graph.num_nodes)
+    distance_matrix = nx.to_numpy_array(graph.graph, nodelist=nodes, weight="distance", nonedge=0.0)
+    price_matrix = nx.to_numpy_array(graph.graph, nodelist=nodes, weight="price", nonedge=0.0)
+    return graph, distance_matrix, price_matrix
 
 
 def test_init_invalid_nodes():
@@ -70,30 +88,33 @@ def test_route_validity(graph):
             f"Invalid path segment between {current_node} and {next_node}"
 
 
+def test_route_path_is_read_only(graph):
+    """Test that a route path cannot be modified in place."""
+    route = graph.get_random_route()
+
+    with pytest.raises(ValueError):
+        route.path[0] = 99
+
+
 @pytest.mark.parametrize("num_nodes,seed", [
     (5, 42),
     (10, 123),
     (32, 999),
-])
+], ids=["5-nodes", "10-nodes", "32-nodes"])
 def test_different_graph_sizes(num_nodes, seed):
     """Test graph creation with different sizes."""
-    graph = SyntheticGraph(num_nodes=num_nodes, random_seed=seed)
+    graph = _make_graph(num_nodes, seed)
     assert nx.is_strongly_connected(graph.graph)
 
 
-def test_route_calculation_correctness(graph):
+def test_route_calculation_correctness(graph_matrices):
     """Test if route calculations (distance and price) are correct."""
+    graph, distance_matrix, price_matrix = graph_matrices
     route = graph.get_random_route()
 
     # Manually calculate totals
-    calculated_distance = sum(
-        graph.graph[u][v]["distance"]
-        for u, v in zip(route.path, route.path[1:])
-    )
-    calculated_price = sum(
-        graph.graph[u][v]["price"]
-        for u, v in zip(route.path, route.path[1:])
-    )
+    calculated_distance = distance_matrix[route.path[:-1], route.path[1:]].sum()
+    calculated_price = price_matrix[route.path[:-1], route.path[1:]].sum()
 
     assert route.total_distance == calculated_distance, "Incorrect distance calculation"
     assert route.total_price == calculated_price, "Incorrect price calculation"
@@ -109,10 +130,28 @@ def test_visualization(graph, tmp_path):
 
 def test_reproducibility():
     """Test if random seed produces consistent results."""
+    # Built directly, a cached graph would be compared with itself
     graph1 = SyntheticGraph(num_nodes=5, random_seed=42)
     graph2 = SyntheticGraph(num_nodes=5, random_seed=42)
 
     # Compare edge sets
     edges1 = set(graph1.graph.edges())
     edges2 = set(graph2.graph.edges())
-    assert edges1 == edges2
\ No newline at end of file
+    assert edges1 == edges2
+
+def test_batched_path_infos(graph):
+    """Test that batched shortest paths match NetworkX path lengths."""
+    pairs = [(u, v) for u in graph.graph.nodes for v in graph.graph.nodes]
+    routes = graph.get_path_infos([u for u, _ in pairs], [v for _, v in pairs])
+
+    for (u, v), route in zip(pairs, routes):
+        assert route.path[0] == u and route.path[-1] == v
+        assert route.total_distance == nx.shortest_path_length(graph.graph, u, v, weight="distance")
+    assert len(graph.get_random_routes(10)) == 10
+
+
+def test_pickled_graph_paths(graph):
+    """Test that an unpickled graph rebuilds its lookups and finds the same paths."""
+    restored = pickle.loads(pickle.dumps(graph))
+    for weight in ("distance", "price"):
+        assert restored.get_path_info(0, 3, weight=weight) == graph.get_path_info(0, 3, weight=weight)